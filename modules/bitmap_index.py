@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+# Columns indexed for each table: the sidebar and partner map filter dimensions
+BITMAP_COLUMNS = {
+    "needs": ["category", "priority", "neighborhood"],
+    "partners": ["type", "focus_area"],
+    "activities": ["category", "neighborhood"]
+}
+
+# Function to build per-value bitmaps for low-cardinality columns
+# Each bitmap is a packed uint8 array with one bit per row (np.packbits order).
+def build_bitmap_index(df, columns):
+    index = {"n_rows": len(df), "columns": {}}
+    for column in columns:
+        codes, values = pd.factorize(df[column], sort=True)
+        index["columns"][column] = {
+            str(value): np.packbits(codes == code) for code, value in enumerate(values)
+        }
+    return index
+
+# Function to build the bitmap indexes of every table in a partition
+def build_table_indexes(tables):
+    return {
+        table: build_bitmap_index(df, BITMAP_COLUMNS[table])
+        for table, df in tables.items() if table in BITMAP_COLUMNS
+    }
+
+# Function to get the memory used by a bitmap index, in bytes
+def bitmap_index_size(index):
+    return sum(bits.nbytes for bitmaps in index["columns"].values() for bits in bitmaps.values())
+
+# Function to find the row positions matching {column: selected values}
+# Values of one column are ORed together and columns are ANDed. A column whose
+# every value is selected is skipped.
+def select_rows(index, selections):
+    n_rows = index["n_rows"]
+    result = None
+
+    for column, values in selections.items():
+        bitmaps = index["columns"][column]
+        selected = {str(value) for value in values}
+        if selected.issuperset(bitmaps):
+            continue
+
+        column_bits = np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+        for value in selected.intersection(bitmaps):
+            np.bitwise_or(column_bits, bitmaps[value], out=column_bits)
+
+        if result is None:
+            result = column_bits
+        else:
+            np.bitwise_and(result, column_bits, out=result)
+
+    if result is None:
+        return np.arange(n_rows)
+    return np.flatnonzero(np.unpackbits(result, count=n_rows))
@@ -1,131 +1,258 @@
 import pandas as pd
 import numpy as np
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
+from string import Formatter
+
+# Reference values shared by the synthetic generators
+NEED_CATEGORIES = ["Environment", "Social Inclusion", "Skills Development"]
+NEED_TITLES = [
+    "Green space maintenance", "Urban gardening support", "Waste reduction initiative",
+    "Elderly companionship program", "Youth mentoring", "Immigrant integration support",
+    "Digital literacy workshops", "Craftsmanship preservation", "Entrepreneurship training",
+    "Recycling awareness", "Sustainable transport promotion", "Biodiversity protection",
+    "Mental health support", "Child care assistance", "Disability access improvements",
+    "Language exchange", "Creative arts training", "Job search assistance"
+]
+PRIORITIES = ["High", "Medium", "Low"]
+NEIGHBORHOODS = ["Centre-ville", "Bas Montreuil", "La Noue", "Villiers-Barbusse", "Signac", "Ruffins"]
+
+# Approximate neighborhood centres as (latitude, longitude), used to place needs on the map
+NEIGHBORHOOD_COORDS = {
+    "Centre-ville": (48.8620, 2.4430),
+    "Bas Montreuil": (48.8560, 2.4280),
+    "La Noue": (48.8655, 2.4600),
+    "Villiers-Barbusse": (48.8580, 2.4520),
+    "Signac": (48.8630, 2.4650),
+    "Ruffins": (48.8680, 2.4700)
+}
 
 # Function to generate synthetic data for local needs
-def generate_local_needs():
-    categories = ["Environment", "Social Inclusion", "Skills Development"]
-    needs = [
-        "Green space maintenance", "Urban gardening support", "Waste reduction initiative",
-        "Elderly companionship program", "Youth mentoring", "Immigrant integration support",
-        "Digital literacy workshops", "Craftsmanship preservation", "Entrepreneurship training",
-        "Recycling awareness", "Sustainable transport promotion", "Biodiversity protection",
-        "Mental health support", "Child care assistance", "Disability access improvements",
-        "Language exchange", "Creative arts training", "Job search assistance"
-    ]
+# Every column is drawn in one pass from a NumPy generator, so large n stays cheap
+# and a fixed seed always reproduces the same frame.
+# identified_date counts back from reference_date (today by default).
+def generate_local_needs(n=15, seed=None, neighborhoods=None, reference_date=None):
+    if neighborhoods is None:
+        neighborhoods = NEIGHBORHOODS
+    if reference_date is None:
+        reference_date = datetime.now().date()
     
-    priorities = ["High", "Medium", "Low"]
-    neighborhoods = ["Centre-ville", "Bas Montreuil", "La Noue", "Villiers-Barbusse", "Signac", "Ruffins"]
-    
-    data = []
-    for i in range(15):
-        category = categories[i % 3]
-        need_index = i % len(needs)
-        data.append({
-            "need_id": i + 1,
-            "need": needs[need_index],
-            "category": category,
-            "priority": random.choice(priorities),
-            "neighborhood": random.choice(neighborhoods),
-            "identified_date": (datetime.now() - timedelta(days=random.randint(1, 90))).strftime("%Y-%m-%d"),
-            "impact_score": random.randint(1, 10)
-        })
-    
-    return pd.DataFrame(data)
+    rng = np.random.default_rng(seed)
+    row = np.arange(n)
+    today = np.datetime64(reference_date, "D")
+    
+    return pd.DataFrame({
+        "need_id": row + 1,
+        "need": pd.Categorical.from_codes(row % len(NEED_TITLES), categories=NEED_TITLES),
+        "category": pd.Categorical.from_codes(row % len(NEED_CATEGORIES), categories=NEED_CATEGORIES),
+        "priority": pd.Categorical.from_codes(rng.integers(0, len(PRIORITIES), n), categories=PRIORITIES),
+        "neighborhood": pd.Categorical.from_codes(rng.integers(0, len(neighborhoods), n), categories=neighborhoods),
+        "identified_date": today - rng.integers(1, 91, n).astype("timedelta64[D]"),
+        "impact_score": rng.integers(1, 11, n)
+    })
+
+# Reference values for partner generation
+PARTNER_TYPES = ["Association", "Community Center", "Social Enterprise", "School", "Local Business"]
+FOCUS_AREAS = ["Environment", "Social Inclusion", "Skills Development", "Multiple"]
+PARTNER_NAMES = [
+    "Eco Montreuil", "Centre Social Esperanza", "La Ruche Sociale", 
+    "Ateliers Partagés", "Association AVEC", "Club des Ainés", 
+    "Jardin Participatif", "Maison de Quartier", "La Recyclerie de l'Est",
+    "École des Arts Urbains", "La Fabrique Solidaire", "Centre Jeunesse Active",
+    "Atelier Numérique", "Collectif Vert", "Association Sportive du Quartier"
+]
+STREETS = ["de Paris", "des Ruffins", "de Vincennes", "Etienne Marcel", "du Capitaine Dreyfus"]
+FIRST_NAMES = ["Marie", "Jean", "Sophie", "Thomas", "Laure"]
+LAST_NAMES = ["Martin", "Dubois", "Petit", "Robert", "Moreau"]
+
+# Bounding boxes as (lat_min, lon_min, lat_max, lon_max)
+LOCATION_BOUNDS = {
+    "Montreuil": (48.84, 2.42, 48.88, 2.46)
+}
 
 # Function to generate synthetic data for local partners
-def generate_local_partners():
-    partner_types = ["Association", "Community Center", "Social Enterprise", "School", "Local Business"]
-    focus_areas = ["Environment", "Social Inclusion", "Skills Development", "Multiple"]
-    
-    partner_names = [
-        "Eco Montreuil", "Centre Social Esperanza", "La Ruche Sociale", 
-        "Ateliers Partagés", "Association AVEC", "Club des Ainés", 
-        "Jardin Participatif", "Maison de Quartier", "La Recyclerie de l'Est",
-        "École des Arts Urbains", "La Fabrique Solidaire", "Centre Jeunesse Active",
-        "Atelier Numérique", "Collectif Vert", "Association Sportive du Quartier"
+# Names, coordinates and contacts are built as whole columns; past the 15 known
+# partners the names repeat with a numeric suffix ("Eco Montreuil 2", ...).
+def generate_local_partners(n=None, seed=None, bounds=None):
+    if n is None:
+        n = len(PARTNER_NAMES)
+    if bounds is None:
+        bounds = LOCATION_BOUNDS["Montreuil"]
+    lat_min, lon_min, lat_max, lon_max = bounds
+    
+    rng = np.random.default_rng(seed)
+    row = np.arange(n)
+    
+    base_names = np.array(PARTNER_NAMES)
+    base_slugs = np.char.replace(np.char.lower(base_names), " ", "")
+    name_idx = row % len(PARTNER_NAMES)
+    repeat = row // len(PARTNER_NAMES)
+    suffix = np.where(repeat > 0, (repeat + 1).astype(str), "")
+    
+    names = np.char.add(base_names[name_idx], np.where(repeat > 0, np.char.add(" ", suffix), ""))
+    websites = np.char.add(np.char.add("https://www.", np.char.add(base_slugs[name_idx], suffix)), ".org")
+    addresses = np.char.add(
+        rng.integers(1, 101, n).astype(str),
+        np.char.add(" Rue ", np.array(STREETS)[rng.integers(0, len(STREETS), n)])
+    )
+    contacts = np.char.add(
+        np.char.add(np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), n)], " "),
+        np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), n)]
+    )
+    
+    return pd.DataFrame({
+        "partner_id": row + 1,
+        "name": names,
+        "type": pd.Categorical.from_codes(rng.integers(0, len(PARTNER_TYPES), n), categories=PARTNER_TYPES),
+        "focus_area": pd.Categorical.from_codes(rng.integers(0, len(FOCUS_AREAS), n), categories=FOCUS_AREAS),
+        "address": addresses,
+        "website": websites,
+        "contact_person": contacts,
+        "latitude": rng.uniform(lat_min, lat_max, n),
+        "longitude": rng.uniform(lon_min, lon_max, n),
+        "previous_engagements": rng.integers(0, 9, n)
+    })
+
+# Activity templates offered for each need category
+ACTIVITY_TEMPLATES = {
+    "Environment": [
+        "neighborhood cleanup", 
+        "urban gardening workshop", 
+        "recycling awareness campaign",
+        "sustainable living workshop",
+        "local biodiversity project"
+    ],
+    "Social Inclusion": [
+        "community gathering", 
+        "cultural exchange event", 
+        "support group",
+        "neighborhood festival",
+        "intergenerational meetup"
+    ],
+    "Skills Development": [
+        "skill-sharing workshop", 
+        "training session", 
+        "mentoring program",
+        "learning circle",
+        "practical demonstration"
     ]
+}
+
+# Function to index partner row positions by focus_area
+def group_partners(partners_df):
+    return partners_df.groupby("focus_area", observed=True).indices
+
+# Function to pick one matching partner row position for every need
+# "Multiple" partners join every focus_area group as a wildcard.
+# Returns -1 for needs that have no compatible partner.
+def match_partners(needs_df, partner_groups, rng):
+    wildcard = partner_groups.get("Multiple", np.empty(0, dtype=np.intp))
     
-    data = []
-    for i in range(len(partner_names)):
-        # Generate somewhat realistic coordinates for Montreuil area
-        lat = 48.86 + random.uniform(-0.02, 0.02)
-        lon = 2.44 + random.uniform(-0.02, 0.02)
-        
-        data.append({
-            "partner_id": i + 1,
-            "name": partner_names[i],
-            "type": random.choice(partner_types),
-            "focus_area": random.choice(focus_areas),
-            "address": f"{random.randint(1, 100)} Rue {random.choice(['de Paris', 'des Ruffins', 'de Vincennes', 'Etienne Marcel', 'du Capitaine Dreyfus'])}",
-            "website": f"https://www.{partner_names[i].lower().replace(' ', '')}.org",
-            "contact_person": f"{random.choice(['Marie', 'Jean', 'Sophie', 'Thomas', 'Laure'])} {random.choice(['Martin', 'Dubois', 'Petit', 'Robert', 'Moreau'])}",
-            "latitude": lat,
-            "longitude": lon,
-            "previous_engagements": random.randint(0, 8)
-        })
-    
-    return pd.DataFrame(data)
+    categories = needs_df["category"].astype(str).to_numpy()
+    partner_pos = np.full(len(needs_df), -1, dtype=np.intp)
+    
+    for category in np.unique(categories):
+        pool = np.concatenate([partner_groups.get(category, np.empty(0, dtype=np.intp)), wildcard])
+        if pool.size == 0:
+            continue
+        rows = np.flatnonzero(categories == category)
+        partner_pos[rows] = pool[rng.integers(0, pool.size, rows.size)]
+    
+    return partner_pos
+
+# Flat list of activity templates; activities store an index into it (activity_code)
+ACTIVITY_BASES = [base for templates in ACTIVITY_TEMPLATES.values() for base in templates]
+TEMPLATE_OFFSETS = dict(zip(
+    ACTIVITY_TEMPLATES,
+    np.cumsum([0] + [len(templates) for templates in ACTIVITY_TEMPLATES.values()][:-1]).tolist()
+))
+
+# Human-readable activity text, only built for rows that are displayed
+ACTIVITY_DESCRIPTION = "Partner with {partner_name} for a {activity} addressing '{need}'"
+
+# Function to pick an activity template code for every need
+def pick_activity_codes(categories, rng):
+    codes = np.empty(len(categories), dtype=np.int8)
+    
+    for category in np.unique(categories):
+        # Unknown categories fall back to the skills templates
+        key = category if category in ACTIVITY_TEMPLATES else "Skills Development"
+        rows = np.flatnonzero(categories == category)
+        codes[rows] = TEMPLATE_OFFSETS[key] + rng.integers(0, len(ACTIVITY_TEMPLATES[key]), rows.size)
+    
+    return codes
+
+# Function to build the description of a single activity row
+def describe_activity(activity):
+    return ACTIVITY_DESCRIPTION.format(
+        partner_name=activity["partner_name"],
+        activity=ACTIVITY_BASES[int(activity["activity_code"])],
+        need=activity["need"]
+    )
+
+# Function to build descriptions for a set of activity rows in one vectorized step
+# Fills ACTIVITY_DESCRIPTION piece by piece, adding each field to the whole column at once.
+def describe_activities(activities_df):
+    bases = np.array(ACTIVITY_BASES, dtype=object)[activities_df["activity_code"].to_numpy(dtype=np.intp)]
+    fields = {
+        "partner_name": activities_df["partner_name"].astype(str).astype(object),
+        "activity": pd.Series(bases, index=activities_df.index, dtype=object),
+        "need": activities_df["need"].astype(str).astype(object)
+    }
+    
+    text = pd.Series("", index=activities_df.index, dtype=object)
+    for literal, field, _, _ in Formatter().parse(ACTIVITY_DESCRIPTION):
+        text = text + literal
+        if field is not None:
+            text = text + fields[field]
+    return text.astype(str)
+
+# Function to build the activity rows for a set of needs
+def build_activities(needs_df, partners_df, partner_groups, rng):
+    partner_pos = match_partners(needs_df, partner_groups, rng)
+    need_rows = np.flatnonzero(partner_pos >= 0)
+    
+    needs = needs_df.iloc[need_rows].reset_index(drop=True)
+    partners = partners_df.iloc[partner_pos[need_rows]].reset_index(drop=True)
+    codes = pick_activity_codes(needs["category"].astype(str).to_numpy(), rng)
+    
+    n = len(need_rows)
+    return pd.DataFrame({
+        "need_id": needs["need_id"],
+        "partner_id": partners["partner_id"],
+        "need": needs["need"],
+        "category": needs["category"],
+        "partner_name": partners["name"].astype(str),
+        "activity_code": codes,
+        "estimated_impact": rng.integers(1, 11, n),
+        "estimated_effort": rng.integers(1, 11, n),
+        "feasibility_score": rng.integers(1, 11, n),
+        "neighborhood": needs["neighborhood"]
+    })
 
 # Function to generate potential engagement activities
-def suggest_engagement_activities(needs_df, partners_df):
-    activities = []
-    
-    for _, need in needs_df.iterrows():
-        # Find partners with matching focus area
-        matching_partners = partners_df[
-            (partners_df["focus_area"] == need["category"]) | 
-            (partners_df["focus_area"] == "Multiple")
-        ]
-        
-        if not matching_partners.empty:
-            # Select a random matching partner
-            partner = matching_partners.sample(1).iloc[0]
-            
-            # Generate activity suggestion
-            activity_base = ""
-            if need["category"] == "Environment":
-                activity_base = random.choice([
-                    "neighborhood cleanup", 
-                    "urban gardening workshop", 
-                    "recycling awareness campaign",
-                    "sustainable living workshop",
-                    "local biodiversity project"
-                ])
-            elif need["category"] == "Social Inclusion":
-                activity_base = random.choice([
-                    "community gathering", 
-                    "cultural exchange event", 
-                    "support group",
-                    "neighborhood festival",
-                    "intergenerational meetup"
-                ])
-            else:  # Skills Development
-                activity_base = random.choice([
-                    "skill-sharing workshop", 
-                    "training session", 
-                    "mentoring program",
-                    "learning circle",
-                    "practical demonstration"
-                ])
-            
-            activity_desc = f"Partner with {partner['name']} for a {activity_base} addressing '{need['need']}'"
-            
-            activities.append({
-                "need_id": need["need_id"],
-                "partner_id": partner["partner_id"],
-                "need": need["need"],
-                "category": need["category"],
-                "partner_name": partner["name"],
-                "activity_description": activity_desc,
-                "estimated_impact": random.randint(1, 10),
-                "estimated_effort": random.randint(1, 10),
-                "feasibility_score": random.randint(1, 10),
-                "neighborhood": need["neighborhood"]
-            })
-    
-    return pd.DataFrame(activities)
+def suggest_engagement_activities(needs_df, partners_df, seed=None):
+    rng = np.random.default_rng(seed)
+    return build_activities(needs_df, partners_df, group_partners(partners_df), rng)
+
+# Function to generate engagement activities in batches of at most batch_size needs
+# Partners are grouped once and only one batch of activities is alive at a time.
+def iter_engagement_activities(needs_df, partners_df, batch_size=50000, seed=None):
+    rng = np.random.default_rng(seed)
+    partner_groups = group_partners(partners_df)
+    
+    for start in range(0, len(needs_df), batch_size):
+        yield build_activities(needs_df.iloc[start:start + batch_size], partners_df, partner_groups, rng)
+
+# Function to stream engagement activities into a CSV file batch by batch
+def write_engagement_activities(needs_df, partners_df, path, batch_size=50000, seed=None):
+    rows_written = 0
+    
+    for i, batch in enumerate(iter_engagement_activities(needs_df, partners_df, batch_size, seed)):
+        batch.to_csv(path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        rows_written += len(batch)
+    
+    return rows_written
 
 # Function to create the impact dashboard data
 def generate_impact_metrics():
@@ -137,4 +264,19 @@ def generate_impact_metrics():
         "partners_engaged": random.randint(8, 15),
         "neighborhoods_reached": random.randint(4, 6),
         "satisfaction_rate": round(random.uniform(80, 98), 1)
-    }
\ No newline at end of file
+    }
+
+# Function to generate the mock series shown on the impact dashboard
+# Generated once per session so the dashboard charts stay stable across reruns.
+def generate_dashboard_data():
+    months = ["November", "December", "January", "February", "March", "April"]
+    neighborhoods = list(NEIGHBORHOODS)
+    return {
+        "impact_metrics": generate_impact_metrics(),
+        "months": months,
+        "participants": [random.randint(15, 40) for _ in range(len(months))],
+        "category_counts": {category: random.randint(3, 10) for category in NEED_CATEGORIES},
+        "neighborhoods": neighborhoods,
+        "activities_count": [random.randint(1, 8) for _ in range(len(neighborhoods))],
+        "engagement_score": [random.randint(1, 10) for _ in range(len(neighborhoods))]
+    }
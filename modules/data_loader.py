@@ -0,0 +1,149 @@
+import os
+import threading
+import pandas as pd
+from modules.data_generator import NEED_CATEGORIES, PRIORITIES, PARTNER_TYPES, FOCUS_AREAS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Column types for each data file; low-cardinality text becomes categorical and
+# scores use the smallest integer type that holds them
+NEEDS_DTYPES = {
+    "need_id": "int32",
+    "need": "category",
+    "category": pd.CategoricalDtype(NEED_CATEGORIES),
+    "priority": pd.CategoricalDtype(PRIORITIES),
+    "neighborhood": "category",
+    "impact_score": "int8"
+}
+
+PARTNERS_DTYPES = {
+    "partner_id": "int32",
+    "name": "str",
+    "type": pd.CategoricalDtype(PARTNER_TYPES),
+    "focus_area": pd.CategoricalDtype(FOCUS_AREAS),
+    "address": "str",
+    "website": "str",
+    "contact_person": "str",
+    "latitude": "float64",
+    "longitude": "float64",
+    "previous_engagements": "int8"
+}
+
+ACTIVITIES_DTYPES = {
+    "need_id": "int32",
+    "partner_id": "int32",
+    "need": "category",
+    "category": pd.CategoricalDtype(NEED_CATEGORIES),
+    "partner_name": "category",
+    "activity_code": "int8",
+    "estimated_impact": "int8",
+    "estimated_effort": "int8",
+    "feasibility_score": "int8",
+    "neighborhood": "category",
+    "match_rank": "int8",
+    "match_score": "float32"
+}
+
+# Parsed frames keyed by path, each stored with the (mtime, size) it was read at.
+# Frames are shared between sessions: copy before modifying them.
+frame_cache = {}
+frame_cache_lock = threading.Lock()
+
+# Function to pick the fastest available CSV parser
+def csv_engine():
+    try:
+        import pyarrow  # noqa: F401
+        return "pyarrow"
+    except ImportError:
+        return "c"
+
+# Function to return the frame parsed by read(path), reusing it while the file's
+# mtime and size are unchanged
+def load_cached(path, read):
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with frame_cache_lock:
+        cached = frame_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    df = read(path)
+
+    with frame_cache_lock:
+        frame_cache[path] = (signature, df)
+    return df
+
+# Function to drop the cached frames of every file in a directory
+def forget_cached(data_dir):
+    data_dir = os.path.abspath(data_dir)
+    with frame_cache_lock:
+        for path in [p for p in frame_cache if os.path.dirname(os.path.abspath(p)) == data_dir]:
+            del frame_cache[path]
+
+# Function to read a CSV file with explicit dtypes
+def read_csv_typed(path, dtypes, parse_dates=None):
+    header = pd.read_csv(path, nrows=0).columns
+    return pd.read_csv(
+        path,
+        engine=csv_engine(),
+        dtype={col: dtype for col, dtype in dtypes.items() if col in header},
+        parse_dates=parse_dates
+    )
+
+# Function to read a CSV file with explicit dtypes through the cache
+def load_csv(path, dtypes, parse_dates=None):
+    return load_cached(path, lambda p: read_csv_typed(p, dtypes, parse_dates))
+
+# Function to load data/needs_data.csv
+def load_needs(path=None):
+    return load_csv(path or os.path.join(DATA_DIR, "needs_data.csv"), NEEDS_DTYPES, parse_dates=["identified_date"])
+
+# Function to load data/partners_data.csv
+def load_partners(path=None):
+    return load_csv(path or os.path.join(DATA_DIR, "partners_data.csv"), PARTNERS_DTYPES)
+
+# Function to load data/activities_data.csv
+def load_activities(path=None):
+    return load_csv(path or os.path.join(DATA_DIR, "activities_data.csv"), ACTIVITIES_DTYPES)
+
+# File stem and CSV loader for each table
+TABLES = {
+    "needs": ("needs_data", load_needs),
+    "partners": ("partners_data", load_partners),
+    "activities": ("activities_data", load_activities)
+}
+
+# File formats in order of preference; binary files are read memory-mapped
+FORMATS = ["arrow", "parquet", "csv"]
+
+# Function to find the preferred non-empty file for a table, or None
+def find_table_file(table, data_dir=DATA_DIR):
+    stem = TABLES[table][0]
+    for fmt in FORMATS:
+        path = os.path.join(data_dir, f"{stem}.{fmt}")
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            return path
+    return None
+
+# Function to load one table from its preferred file
+def load_table(table, data_dir=DATA_DIR):
+    path = find_table_file(table, data_dir)
+    if path is None:
+        raise FileNotFoundError(f"No data file for {table!r} in {data_dir}")
+    
+    if path.endswith(".csv"):
+        return TABLES[table][1](path)
+    
+    # pyarrow is only needed once binary files exist
+    from modules import storage
+    read = storage.read_arrow if path.endswith(".arrow") else storage.read_parquet
+    return load_cached(path, read)
+
+# Function to check that every table has a data file
+def data_files_available(data_dir=DATA_DIR):
+    return all(find_table_file(table, data_dir) is not None for table in TABLES)
+
+# Function to load needs, partners and activities from a data directory
+def load_all(data_dir=DATA_DIR):
+    return {table: load_table(table, data_dir) for table in TABLES}
@@ -0,0 +1,101 @@
+import argparse
+import os
+import sqlite3
+import threading
+import pandas as pd
+from modules.data_loader import DATA_DIR, NEEDS_DTYPES, PARTNERS_DTYPES, ACTIVITIES_DTYPES, load_all
+
+DATABASE_PATH = os.path.join(DATA_DIR, "planner.db")
+
+# Columns indexed for each table; these are the sidebar and partner map filters
+INDEXES = {
+    "needs": ["category", "priority", "neighborhood"],
+    "partners": ["type", "focus_area"],
+    "activities": ["category", "neighborhood"]
+}
+
+TABLE_DTYPES = {
+    "needs": NEEDS_DTYPES,
+    "partners": PARTNERS_DTYPES,
+    "activities": ACTIVITIES_DTYPES
+}
+
+# Read-only connections shared by every session, keyed by path and stored with the
+# (mtime, size) of the file they were opened on. Streamlit runs each rerun on a new
+# thread, so a per-thread connection would be reopened on every rerun.
+connections = {}
+connections_lock = threading.Lock()
+
+# Function to get the database path when the SQL backend is enabled, or None
+def database_path(path=DATABASE_PATH):
+    return path if os.path.isfile(path) else None
+
+# Function to build the SQLite database and its filter indexes from frames
+def build_database(tables, path=DATABASE_PATH):
+    if os.path.exists(path):
+        os.remove(path)
+
+    with sqlite3.connect(path) as conn:
+        for table, df in tables.items():
+            df.to_sql(table, conn, index=False)
+            for column in INDEXES.get(table, []):
+                conn.execute(f"CREATE INDEX idx_{table}_{column} ON {table} ({column})")
+        conn.execute("ANALYZE")
+    conn.close()
+    return path
+
+# Function to get the shared read-only connection to a database
+# A rebuilt database file gets a new connection. The old one is only dropped from
+# the cache, not closed, since other threads may still be reading through it; it is
+# closed when the last of them lets go of it.
+def get_connection(path=DATABASE_PATH):
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    
+    with connections_lock:
+        cached = connections.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        # Queries only read, so one connection can serve every thread
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        connections[path] = (signature, conn)
+        return conn
+
+# Function to run a filtered SELECT and restore the loader's column types
+# filters maps a column to the list of accepted values; every filter must match.
+# columns optionally limits the columns read (default: all).
+def query_table(table, filters, path=DATABASE_PATH, columns=None):
+    clauses, params = [], []
+    for column, values in filters.items():
+        values = list(values)
+        clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+        params.extend(str(v) for v in values)
+
+    sql = f"SELECT {', '.join(columns) if columns else '*'} FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+
+    df = pd.read_sql_query(sql, get_connection(path), params=params)
+    dtypes = {col: dtype for col, dtype in TABLE_DTYPES[table].items() if col in df.columns}
+    df = df.astype(dtypes)
+    if "identified_date" in df.columns:
+        df["identified_date"] = pd.to_datetime(df["identified_date"])
+    return df
+
+# Function to list the distinct values of a column using its index
+def distinct_values(table, column, path=DATABASE_PATH):
+    rows = get_connection(path).execute(f"SELECT DISTINCT {column} FROM {table} ORDER BY {column}").fetchall()
+    return [row[0] for row in rows]
+
+# Command line entry point: python -m modules.database --src data
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the SQLite store used for filter pushdown.")
+    parser.add_argument("--src", default=DATA_DIR, help="directory holding the planner data files")
+    parser.add_argument("--db", default=DATABASE_PATH, help="database file to create")
+    args = parser.parse_args(argv)
+
+    print(f"database -> {build_database(load_all(args.src), args.db)}")
+
+if __name__ == "__main__":
+    main()
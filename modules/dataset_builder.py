@@ -0,0 +1,93 @@
+import argparse
+import os
+import numpy as np
+from modules.data_generator import generate_local_needs, generate_local_partners
+from modules.parallel import suggest_activities_parallel
+
+# Named scale factors; SF1 is the size of the built-in Montreuil demo data
+SCALE_FACTORS = {
+    "SF1": 1,
+    "SF10": 10,
+    "SF100": 100,
+    "SF1000": 1000,
+    "SF10000": 10000
+}
+
+BASE_NEEDS = 15
+BASE_PARTNERS = 15
+
+# Fixed seed and date so that every build of a scale factor is identical
+DATASET_SEED = 20250430
+REFERENCE_DATE = "2025-04-30"
+
+# File names shared with the data/ directory
+TABLE_FILES = {
+    "needs": "needs_data",
+    "partners": "partners_data",
+    "activities": "activities_data"
+}
+
+# Function to turn "SF100", "100" or 100 into a multiplier
+def scale_factor(scale):
+    if isinstance(scale, str):
+        key = scale.upper()
+        if key in SCALE_FACTORS:
+            return SCALE_FACTORS[key]
+        scale = key[2:] if key.startswith("SF") else key
+    factor = int(scale)
+    if factor < 1:
+        raise ValueError(f"Scale factor must be at least 1, got {scale!r}")
+    return factor
+
+# Function to build consistent needs, partners and activities tables for a scale factor
+def build_dataset(scale="SF1", seed=DATASET_SEED, k=3, max_workers=None):
+    factor = scale_factor(scale)
+    needs_seed, partners_seed, activities_seed = (
+        int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(3)
+    )
+    
+    needs_df = generate_local_needs(BASE_NEEDS * factor, seed=needs_seed, reference_date=REFERENCE_DATE)
+    partners_df = generate_local_partners(BASE_PARTNERS * factor, seed=partners_seed)
+    activities_df = suggest_activities_parallel(
+        needs_df, partners_df, max_workers=max_workers, k=k, seed=activities_seed
+    )
+    
+    return {
+        "needs": needs_df,
+        "partners": partners_df,
+        "activities": activities_df
+    }
+
+# Function to write dataset tables as data/*.csv style files or Parquet
+def write_dataset(tables, out_dir, fmt="csv"):
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    
+    for table, df in tables.items():
+        path = os.path.join(out_dir, f"{TABLE_FILES[table]}.{fmt}")
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        elif fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            raise ValueError(f"Unsupported format {fmt!r}, expected 'csv' or 'parquet'")
+        paths[table] = path
+    
+    return paths
+
+# Command line entry point: python -m modules.dataset_builder --scale SF100 --out data/sf100
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a deterministic benchmark dataset.")
+    parser.add_argument("--scale", default="SF1", help="scale factor name or multiplier (default: SF1)")
+    parser.add_argument("--out", default="data", help="output directory (default: data)")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"], dest="fmt")
+    parser.add_argument("--seed", type=int, default=DATASET_SEED)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    
+    tables = build_dataset(args.scale, seed=args.seed, max_workers=args.workers)
+    for table, path in write_dataset(tables, args.out, args.fmt).items():
+        print(f"{table}: {len(tables[table])} rows -> {path}")
+
+if __name__ == "__main__":
+    main()
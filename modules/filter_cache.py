@@ -0,0 +1,92 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Maximum number of filter results kept (WELLOW_FILTER_CACHE_SIZE, default 64)
+filter_cache_size = int(os.environ.get("WELLOW_FILTER_CACHE_SIZE", "64"))
+
+# Memory budget for filter results, in bytes (WELLOW_FILTER_CACHE_MB, default 128)
+filter_cache_budget = int(os.environ.get("WELLOW_FILTER_CACHE_MB", "128")) * 2**20
+
+# Filter results in least- to most-recently used order, shared by all sessions:
+# key -> (result, size in bytes). Results are read-only, like the tables they were
+# filtered from.
+filter_results = OrderedDict()
+filter_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+filter_lock = threading.Lock()
+
+# Function to estimate the memory held by a cached result, in bytes
+# Handles frames, arrays and the dicts/tuples/lists that hold them (e.g. an index).
+def result_size(result):
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(index=True, deep=True).sum())
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, dict):
+        return sum(result_size(value) for value in result.values())
+    if isinstance(result, (tuple, list)):
+        return sum(result_size(value) for value in result)
+    return 0
+
+# Function to drop least recently used results until both limits are met
+# The most recently used result is always kept. Call with filter_lock held.
+def evict_filter_results():
+    while len(filter_results) > 1 and (
+        len(filter_results) > filter_cache_size or filter_stats["bytes"] > filter_cache_budget
+    ):
+        _, (_, size) = filter_results.popitem(last=False)
+        filter_stats["bytes"] -= size
+        filter_stats["evictions"] += 1
+
+# Function to turn widget selections into a hashable key that ignores order
+def normalize_selections(selections):
+    return tuple(
+        (name, tuple(sorted(str(value) for value in values)))
+        for name, values in sorted(selections.items())
+    )
+
+# Function to return compute() for a filter state, reusing earlier results
+# table names the filtered table, data_version identifies the data it is filtered
+# from, and selections maps each filter to its selected values.
+def cached_filter(table, data_version, selections, compute):
+    key = (table, data_version, normalize_selections(selections))
+
+    with filter_lock:
+        if key in filter_results:
+            filter_results.move_to_end(key)
+            filter_stats["hits"] += 1
+            return filter_results[key][0]
+        filter_stats["misses"] += 1
+
+    result = compute()
+    size = result_size(result)
+
+    with filter_lock:
+        if key in filter_results:
+            filter_stats["bytes"] -= filter_results[key][1]
+        filter_results[key] = (result, size)
+        filter_results.move_to_end(key)
+        filter_stats["bytes"] += size
+        evict_filter_results()
+    return result
+
+# Function to drop the cached results computed from a location's data
+# data_version values start with the location name (see initialize_session_state).
+def forget_location_results(location):
+    with filter_lock:
+        for key in [k for k in filter_results if k[1] and k[1][0] == location]:
+            _, size = filter_results.pop(key)
+            filter_stats["bytes"] -= size
+
+# Function to report cache hits, misses, evictions, current size and bytes held
+def filter_cache_stats():
+    with filter_lock:
+        return dict(filter_stats, size=len(filter_results))
+
+# Function to empty the filter cache
+def clear_filter_cache():
+    with filter_lock:
+        filter_results.clear()
+        filter_stats["bytes"] = 0
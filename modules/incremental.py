@@ -0,0 +1,77 @@
+import pandas as pd
+import numpy as np
+from pandas.api.types import union_categoricals
+from modules.data_generator import NEED_CATEGORIES
+from modules.scoring import need_coordinates, suggest_scored_activities
+
+# Function to append rows to a frame while keeping the frame's column types
+# Categorical columns get the union of both category sets instead of falling back
+# to object dtype.
+def append_rows(base_df, new_df):
+    if new_df.empty:
+        return base_df
+
+    combined = pd.concat([base_df, new_df[base_df.columns]], ignore_index=True)
+    for col in base_df.columns:
+        dtype = base_df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            combined[col] = pd.Series(
+                union_categoricals([base_df[col].array, pd.Categorical(new_df[col])], ignore_order=True),
+                index=combined.index
+            )
+        elif combined[col].dtype != dtype:
+            combined[col] = combined[col].astype(dtype)
+    return combined
+
+# Function to list the need categories whose candidate partners include a focus area
+def categories_for_focus(focus_areas):
+    focus_areas = set(focus_areas)
+    if "Multiple" in focus_areas:
+        return set(NEED_CATEGORIES)
+    return focus_areas
+
+# Function to append new needs and suggest activities for those needs only
+# New needs without a need_id are numbered after the current highest id.
+# Returns the updated (needs_df, activities_df).
+def append_needs(needs_df, partners_df, activities_df, new_needs, k=3, seed=None):
+    if "need_id" not in new_needs.columns:
+        start = int(needs_df["need_id"].max()) + 1 if len(needs_df) else 1
+        new_needs = new_needs.assign(need_id=np.arange(start, start + len(new_needs)))
+
+    new_activities = suggest_scored_activities(new_needs, partners_df, k=k, seed=seed)
+    return append_rows(needs_df, new_needs), append_rows(activities_df, new_activities)
+
+# Function to get the partners' mean (latitude, longitude)
+def partner_centroid(partners_df):
+    return (partners_df["latitude"].mean(), partners_df["longitude"].mean())
+
+# Function to add, change or remove partners and refresh only the affected suggestions
+# A need is recomputed when it currently uses a changed or removed partner, or when
+# its category is compatible with a changed partner's old or new focus area. Needs
+# without coordinates are placed at the partners' centroid, so they are also
+# recomputed when the centroid moves. Scores of other pairs do not depend on the
+# rest of the partner table, so suggestions of all other needs are kept as they are
+# and match a full recompute.
+# Returns the updated (partners_df, activities_df).
+def update_partners(needs_df, partners_df, activities_df, changed_partners, removed_ids=(), k=3, seed=None):
+    changed_ids = set(changed_partners["partner_id"]) | set(removed_ids)
+    touched = partners_df["partner_id"].isin(changed_ids)
+
+    focus_areas = set(partners_df.loc[touched, "focus_area"].astype(str))
+    focus_areas |= set(changed_partners["focus_area"].astype(str))
+
+    updated_partners = append_rows(partners_df[~touched].reset_index(drop=True), changed_partners)
+    updated_partners = updated_partners.sort_values("partner_id", kind="stable").reset_index(drop=True)
+
+    affected = needs_df["category"].astype(str).isin(categories_for_focus(focus_areas))
+    if partner_centroid(updated_partners) != partner_centroid(partners_df):
+        affected |= np.isnan(need_coordinates(needs_df, None)[0])
+    affected |= needs_df["need_id"].isin(activities_df.loc[activities_df["partner_id"].isin(changed_ids), "need_id"])
+    affected_ids = needs_df.loc[affected, "need_id"]
+
+    kept = activities_df[~activities_df["need_id"].isin(affected_ids)].reset_index(drop=True)
+    refreshed = suggest_scored_activities(needs_df[affected], updated_partners, k=k, seed=seed)
+
+    sort_cols = ["need_id", "match_rank"] if "match_rank" in kept.columns else ["need_id"]
+    updated_activities = append_rows(kept, refreshed).sort_values(sort_cols, kind="stable").reset_index(drop=True)
+    return updated_partners, updated_activities
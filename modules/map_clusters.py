@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+# Above this many partners the map shows grid clusters instead of single points
+CLUSTER_THRESHOLD = 2000
+
+METERS_PER_DEGREE = 111_000
+
+# Smallest cluster marker radius, in meters
+MIN_RADIUS_M = 10
+
+# Function to get the grid size whose clusters never outnumber CLUSTER_THRESHOLD
+# There is at most one cluster per cell and focus area: cells² × n_focus markers.
+def grid_cells(n_focus):
+    return max(1, int(np.sqrt(CLUSTER_THRESHOLD / max(n_focus, 1))))
+
+# Function to bin partners into a grid and count them per cell and focus area
+# cells is the number of grid cells along each axis of the partners' bounding box;
+# by default it comes from grid_cells, so the map gets at most CLUSTER_THRESHOLD
+# markers (22 × 22 cells × 4 focus areas = 1,936) however many partners there are.
+# Each cluster sits at the mean position of its partners. radius_m is the marker
+# radius in meters: half a cell for the largest cluster, scaled by the square root
+# of the count so marker area follows the number of partners.
+def cluster_points(partners_df, cells=None):
+    columns = ['latitude', 'longitude', 'focus_area', 'count', 'radius_m']
+    if partners_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    lat = partners_df['latitude'].to_numpy(dtype=np.float64)
+    lon = partners_df['longitude'].to_numpy(dtype=np.float64)
+    focus = pd.Categorical(partners_df['focus_area'])
+    if cells is None:
+        cells = grid_cells(len(focus.categories))
+
+    # Cell size in degrees; a degenerate extent still gets a non-zero cell
+    cell_lat = max(np.ptp(lat), 1e-6) / cells
+    cell_lon = max(np.ptp(lon), 1e-6) / cells
+    row = np.minimum(((lat - lat.min()) / cell_lat).astype(np.int64), cells - 1)
+    col = np.minimum(((lon - lon.min()) / cell_lon).astype(np.int64), cells - 1)
+
+    # One group per (cell, focus area)
+    n_focus = max(len(focus.categories), 1)
+    group = (row * cells + col) * n_focus + focus.codes
+    keys, inverse = np.unique(group, return_inverse=True)
+    counts = np.bincount(inverse)
+
+    clusters = pd.DataFrame({
+        'latitude': np.bincount(inverse, weights=lat) / counts,
+        'longitude': np.bincount(inverse, weights=lon) / counts,
+        'focus_area': pd.Categorical.from_codes(keys % n_focus, focus.categories),
+        'count': counts
+    })
+    half_cell_m = min(cell_lat, cell_lon) * METERS_PER_DEGREE / 2
+    clusters['radius_m'] = np.maximum(half_cell_m * np.sqrt(counts / counts.max()), MIN_RADIUS_M)
+    return clusters[columns]
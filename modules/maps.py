@@ -0,0 +1,34 @@
+import streamlit as st
+from modules.utils import MAP_COLORS, focus_colors, paginate, render_partner_rows
+
+# Function to create a retro-styled map using Streamlit's built-in map
+# Above CLUSTER_THRESHOLD partners, pass clusters from cluster_points to draw one
+# marker per grid cell and focus area instead of one per partner.
+# Lives outside modules.visualizations so the partner map page does not import Plotly.
+def create_retro_map(df, clusters=None):
+    if clusters is None:
+        map_df = df[['latitude', 'longitude']].assign(color=focus_colors(df['focus_area'], MAP_COLORS))
+        st.map(map_df, color='color')
+    else:
+        # Marker size follows the number of partners in each cluster
+        map_df = clusters[['latitude', 'longitude', 'radius_m']].assign(color=focus_colors(clusters['focus_area'], MAP_COLORS))
+        st.map(map_df, color='color', size='radius_m')
+        st.markdown(f"""
+        <div style="margin-top: 10px; text-align: center;">
+            <span style="font-family: 'Space Mono', monospace; font-size: 14px; color: white;">
+                {len(df)} partners grouped into {len(clusters)} clusters
+            </span>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Display a legend for the map
+    st.markdown("""
+    <div style="margin-top: 10px; text-align: center;">
+        <span style="font-family: 'Space Mono', monospace; font-size: 14px; color: white;">
+            Map markers represent partner locations (hover for details)
+        </span>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Create a table with partner details, one page at a time
+    render_partner_rows(paginate(df, "map_partners"))
@@ -0,0 +1,82 @@
+import argparse
+import importlib
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Module and function drawing each page, in navigation order
+PAGES = {
+    "Local Needs Overview": ("pages.needs_overview", "show_needs_overview"),
+    "Partner Map": ("pages.partner_map", "show_partner_map"),
+    "Engagement Suggester": ("pages.engagement_suggester", "show_engagement_suggester"),
+    "Impact Dashboard": ("pages.impact_dashboard", "show_impact_dashboard")
+}
+
+# Modules app.py imports before drawing any page
+APP_MODULES = ["streamlit", "modules.styles", "modules.utils", "modules.database", "modules.partitions"]
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent on the first import of each page and the first full run of the
+# app, per process. Only the first value of each stage is kept.
+startup_times = {}
+startup_lock = threading.Lock()
+
+# Function to record how long a startup stage took since started (a perf_counter value)
+def record_startup(stage, started):
+    with startup_lock:
+        if stage in startup_times:
+            return
+        startup_times[stage] = time.perf_counter() - started
+    logger.info("startup: %s %.3fs", stage, startup_times[stage])
+
+# Function to get a page's show function, importing its module on first navigation
+# Later calls reuse the module from sys.modules.
+def load_page(page):
+    module_name, function_name = PAGES[page]
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    record_startup(f"import {module_name}", started)
+    return getattr(module, function_name)
+
+# Function to measure the import time of modules in a fresh interpreter
+# Each module is imported after the ones before it, as on a cold worker.
+def measure_imports(modules):
+    code = (
+        "import sys, time\n"
+        "for name in sys.argv[1:]:\n"
+        "    started = time.perf_counter()\n"
+        "    __import__(name)\n"
+        "    print(name, time.perf_counter() - started)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", code, *modules], cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+    return {name: float(seconds) for name, seconds in (line.split() for line in output.splitlines())}
+
+# Command line entry point: python -m modules.page_loader --repeat 3
+# Prints the cold import time of the app modules and then of each page on top of them.
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold-start import times of the app and its pages.")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per measurement; the best run is kept")
+    args = parser.parse_args(argv)
+
+    def best(modules):
+        runs = [measure_imports(modules) for _ in range(args.repeat)]
+        return {name: min(run[name] for run in runs) for name in modules}
+
+    app_times = best(APP_MODULES)
+    for name, seconds in app_times.items():
+        print(f"{name:<32} {seconds:.3f}s")
+    print(f"{'app total':<32} {sum(app_times.values()):.3f}s")
+
+    for page, (module_name, _) in PAGES.items():
+        seconds = best(APP_MODULES + [module_name])[module_name]
+        print(f"{page:<32} +{seconds:.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from modules.data_generator import suggest_engagement_activities
+from modules.scoring import suggest_scored_activities
+
+# Partner table held by each worker process, set once by init_worker
+worker_partners = None
+
+# Function to receive the partner table once per worker process
+def init_worker(partners_df):
+    global worker_partners
+    worker_partners = partners_df
+
+# Function to generate activities for one partition of needs inside a worker
+def suggest_partition(needs_df, scored, k, seed):
+    if scored:
+        return suggest_scored_activities(needs_df, worker_partners, k=k, seed=seed)
+    return suggest_engagement_activities(needs_df, worker_partners, seed=seed)
+
+# Function to split needs into partitions sorted by key
+def partition_needs(needs_df, partition_by):
+    groups = needs_df.groupby(needs_df[partition_by].astype(str), sort=True, observed=True)
+    return [part for _, part in groups]
+
+# Function to generate engagement activities in parallel, one task per partition
+# Needs are split by partition_by ("neighborhood", or a "location" column for
+# multi-city data). Partners are shipped to each worker once, and each partition
+# gets its own seed derived from seed, so results do not depend on scheduling.
+def suggest_activities_parallel(needs_df, partners_df, partition_by="neighborhood", max_workers=None, scored=True, k=3, seed=None):
+    partitions = partition_needs(needs_df, partition_by)
+    if not partitions:
+        init_worker(partners_df)
+        return suggest_partition(needs_df, scored, k, seed)
+    
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(partitions))]
+    
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(partitions))
+    
+    if max_workers <= 1:
+        init_worker(partners_df)
+        results = [suggest_partition(part, scored, k, s) for part, s in zip(partitions, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker, initargs=(partners_df,)) as executor:
+            results = list(executor.map(suggest_partition, partitions, [scored] * len(partitions), [k] * len(partitions), seeds))
+    
+    # Restore the serial ordering: by need_id, then by match rank
+    activities = pd.concat(results, ignore_index=True)
+    sort_cols = ["need_id", "match_rank"] if "match_rank" in activities.columns else ["need_id"]
+    return activities.sort_values(sort_cols, kind="stable").reset_index(drop=True)
@@ -0,0 +1,136 @@
+import os
+import threading
+import zlib
+import pandas as pd
+from collections import OrderedDict
+from modules.data_loader import DATA_DIR, TABLES, find_table_file, forget_cached, load_all
+from modules.data_generator import LOCATION_BOUNDS, NEIGHBORHOOD_COORDS
+from modules.bitmap_index import bitmap_index_size, build_table_indexes
+from modules.filter_cache import forget_location_results
+from modules.scoring import suggest_scored_activities
+
+DEFAULT_LOCATION = "Montreuil"
+
+# Locations offered even before they have data files
+PLACEHOLDER_LOCATIONS = ["Future Location 1", "Future Location 2"]
+
+# Each extra location keeps its files in data/locations/<location name>/
+LOCATIONS_DIR = os.path.join(DATA_DIR, "locations")
+
+# Optional file in a location's data directory with its neighborhood centres
+# (columns neighborhood, latitude, longitude)
+NEIGHBORHOODS_FILE = "neighborhoods.csv"
+
+# Memory budget for loaded partitions, in bytes (WELLOW_PARTITION_BUDGET_MB, default 512)
+partition_budget = int(os.environ.get("WELLOW_PARTITION_BUDGET_MB", "512")) * 2**20
+
+# Loaded partitions in least- to most-recently used order:
+# (location, data version) -> (tables, bitmap indexes, size in bytes).
+# The tables are shared by every session in the process and must not be modified.
+partitions = OrderedDict()
+partitions_lock = threading.Lock()
+
+# Function to change the memory budget for loaded partitions
+def set_partition_budget(megabytes):
+    global partition_budget
+    partition_budget = int(megabytes * 2**20)
+    with partitions_lock:
+        evict_partitions()
+
+# Function to get the data directory of a location
+def location_dir(location):
+    if location == DEFAULT_LOCATION:
+        return DATA_DIR
+    return os.path.join(LOCATIONS_DIR, location)
+
+# Function to get the neighborhood centres of a location as
+# {neighborhood: (latitude, longitude)}
+# Read from the location's neighborhoods.csv; without one, the default location uses
+# the built-in Montreuil centres and any other location has none.
+def neighborhood_coords(location):
+    path = os.path.join(location_dir(location), NEIGHBORHOODS_FILE)
+    if os.path.isfile(path):
+        df = pd.read_csv(path)
+        return {row.neighborhood: (row.latitude, row.longitude) for row in df.itertuples(index=False)}
+    if location == DEFAULT_LOCATION:
+        return NEIGHBORHOOD_COORDS
+    return {}
+
+# Function to list the selectable locations
+def list_locations():
+    found = []
+    if os.path.isdir(LOCATIONS_DIR):
+        found = sorted(name for name in os.listdir(LOCATIONS_DIR) if os.path.isdir(os.path.join(LOCATIONS_DIR, name)))
+    # dict.fromkeys keeps the order and drops duplicates
+    return list(dict.fromkeys([DEFAULT_LOCATION] + found + PLACEHOLDER_LOCATIONS))
+
+# Function to get the version of a location's data: the name, mtime and size of
+# each table file, or None when the location has no files and uses demo data
+def data_version(location):
+    version = []
+    for table in TABLES:
+        path = find_table_file(table, location_dir(location))
+        if path is None:
+            return None
+        stat = os.stat(path)
+        version.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+# Function to generate demo data for a location that has no data files
+# The seed comes from the location name so a location always gets the same data.
+def generate_partition(location, data_generator):
+    seed = zlib.crc32(location.encode("utf-8"))
+    needs_df = data_generator.generate_local_needs(seed=seed)
+    partners_df = data_generator.generate_local_partners(
+        seed=seed + 1, bounds=LOCATION_BOUNDS.get(location, LOCATION_BOUNDS[DEFAULT_LOCATION])
+    )
+    return {
+        "needs": needs_df,
+        "partners": partners_df,
+        "activities": suggest_scored_activities(needs_df, partners_df, seed=seed + 2)
+    }
+
+# Function to estimate the memory held by a partition's tables and indexes
+def partition_size(tables, indexes):
+    size = sum(df.memory_usage(index=True, deep=True).sum() for df in tables.values())
+    return int(size + sum(bitmap_index_size(index) for index in indexes.values()))
+
+# Function to evict least recently used partitions until the budget is met
+# The most recently used partition is always kept. Call with partitions_lock held.
+def evict_partitions():
+    total = sum(size for _, _, size in partitions.values())
+    while len(partitions) > 1 and total > partition_budget:
+        (location, _), (_, _, size) = partitions.popitem(last=False)
+        forget_cached(location_dir(location))
+        # Cached filter results may hold slices of the evicted tables
+        forget_location_results(location)
+        total -= size
+
+# Function to get the shared tables of a location and their bitmap indexes,
+# loading them on first use
+# A partition is reloaded when its data files change; the outdated version is dropped.
+def load_partition(location, data_generator):
+    version = data_version(location)
+    key = (location, version)
+    with partitions_lock:
+        if key in partitions:
+            partitions.move_to_end(key)
+            return partitions[key][:2]
+
+    if version is not None:
+        tables = load_all(location_dir(location))
+    else:
+        tables = generate_partition(location, data_generator)
+    indexes = build_table_indexes(tables)
+
+    with partitions_lock:
+        for old_key in [k for k in partitions if k[0] == location]:
+            del partitions[old_key]
+        partitions[key] = (tables, indexes, partition_size(tables, indexes))
+        evict_partitions()
+    return tables, indexes
+
+# Function to list the loaded partitions and their sizes in bytes, oldest first
+def loaded_partitions():
+    with partitions_lock:
+        return [(location, size) for (location, _), (_, _, size) in partitions.items()]
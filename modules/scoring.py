@@ -0,0 +1,191 @@
+import pandas as pd
+import numpy as np
+from modules.data_generator import NEIGHBORHOOD_COORDS, group_partners, pick_activity_codes
+
+# Weights of each score component; the total score is scaled to 0-10
+SCORE_WEIGHTS = {
+    "focus": 0.35,
+    "proximity": 0.30,
+    "experience": 0.15,
+    "impact": 0.20
+}
+
+# Focus match value for a partner whose focus_area is "Multiple"
+WILDCARD_FOCUS = 0.5
+
+# Distance (km) at which the proximity component drops to one half
+PROXIMITY_SCALE_KM = 2.0
+
+# Previous engagements at which the experience component is full. A fixed cap keeps
+# every score independent of the other partners, so adding or changing one partner
+# never moves the scores of pairs it is not part of (see modules.incremental).
+ENGAGEMENT_CAP = 8
+
+KM_PER_DEGREE_LAT = 110.57
+KM_PER_DEGREE_LON = 111.32
+
+# Function to get (latitude, longitude) arrays for needs
+# Uses the needs' own coordinates when present, otherwise their neighborhood centre
+# from coords (neighborhood -> (latitude, longitude)). Needs in unknown
+# neighborhoods are placed at centroid, or left as NaN when centroid is None.
+def need_coordinates(needs_df, centroid, coords=NEIGHBORHOOD_COORDS):
+    if "latitude" in needs_df.columns and "longitude" in needs_df.columns:
+        lat = needs_df["latitude"].to_numpy(dtype=np.float64)
+        lon = needs_df["longitude"].to_numpy(dtype=np.float64)
+    else:
+        neighborhoods = needs_df["neighborhood"].astype(str)
+        lat = neighborhoods.map(lambda n: coords.get(n, (np.nan, np.nan))[0]).to_numpy(dtype=np.float64)
+        lon = neighborhoods.map(lambda n: coords.get(n, (np.nan, np.nan))[1]).to_numpy(dtype=np.float64)
+    
+    if centroid is None:
+        return lat, lon
+    lat = np.where(np.isnan(lat), centroid[0], lat)
+    lon = np.where(np.isnan(lon), centroid[1], lon)
+    return lat, lon
+
+# Function to compute distances (km) between coordinate arrays that broadcast together
+def distance_km(lat_a, lon_a, lat_b, lon_b):
+    # Equirectangular approximation, accurate enough at city scale
+    dy = (lat_b - lat_a) * KM_PER_DEGREE_LAT
+    dx = (lon_b - lon_a) * KM_PER_DEGREE_LON * np.cos(np.radians((lat_a + lat_b) / 2))
+    return np.sqrt(dx * dx + dy * dy)
+
+# Function to score one block of needs against one block of partners
+# Inputs are float32 column arrays for the block; need_lon_scale is km per degree of
+# longitude at each need's latitude. Returns a (needs x partners) matrix.
+def score_block(need_lat, need_lon, need_lon_scale, need_impact, partner_lat, partner_lon, partner_static):
+    dy = (partner_lat[None, :] - need_lat[:, None]) * np.float32(KM_PER_DEGREE_LAT)
+    dx = (partner_lon[None, :] - need_lon[:, None]) * need_lon_scale[:, None]
+    distance = np.sqrt(dx * dx + dy * dy)
+    
+    scores = np.float32(SCORE_WEIGHTS["proximity"] * 10) / (1 + distance / np.float32(PROXIMITY_SCALE_KM))
+    scores += partner_static[None, :]
+    scores += need_impact[:, None]
+    return scores
+
+# Function to keep the k best (score, partner position) pairs per row
+def merge_top_k(best_score, best_pos, scores, positions, k):
+    if scores.shape[1] > k:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, top, axis=1)
+        positions = positions[top]
+    else:
+        positions = np.broadcast_to(positions, scores.shape)
+    
+    cand_score = np.concatenate([best_score, scores], axis=1)
+    cand_pos = np.concatenate([best_pos, positions], axis=1)
+    top = np.argpartition(-cand_score, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(cand_score, top, axis=1), np.take_along_axis(cand_pos, top, axis=1)
+
+# Function to find the top-k compatible partners for every need
+# The need x partner matrix is never materialized: needs and partners are scored in
+# need_block x partner_block tiles and only a running top-k per need is kept.
+# Returns need_id, partner_id, rank (1 = best), match_score and distance_km.
+def score_partners(needs_df, partners_df, k=3, need_block=512, partner_block=2048):
+    partner_groups = group_partners(partners_df)
+    wildcard = partner_groups.get("Multiple", np.empty(0, dtype=np.intp))
+    
+    need_lat, need_lon = need_coordinates(needs_df, (partners_df["latitude"].mean(), partners_df["longitude"].mean()))
+    # impact_score is already on a 0-10 scale
+    need_impact = needs_df["impact_score"].to_numpy(dtype=np.float64)
+    categories = needs_df["category"].astype(str).to_numpy()
+    
+    partner_lat = partners_df["latitude"].to_numpy(dtype=np.float64)
+    partner_lon = partners_df["longitude"].to_numpy(dtype=np.float64)
+    engagements = partners_df["previous_engagements"].to_numpy(dtype=np.float64)
+    partner_experience = np.log1p(np.minimum(engagements, ENGAGEMENT_CAP)) / np.log1p(ENGAGEMENT_CAP)
+    
+    # Longitude differences are scaled to km at each need's own latitude, so no
+    # term depends on which other partners are in the table
+    need_lat32 = need_lat.astype(np.float32)
+    need_lon32 = need_lon.astype(np.float32)
+    need_lon_scale = (KM_PER_DEGREE_LON * np.cos(np.radians(need_lat))).astype(np.float32)
+    need_impact_term = (SCORE_WEIGHTS["impact"] * need_impact).astype(np.float32)
+    partner_lat32 = partner_lat.astype(np.float32)
+    partner_lon32 = partner_lon.astype(np.float32)
+    
+    need_rows_out, partner_pos_out, scores_out = [], [], []
+    
+    for category in np.unique(categories):
+        exact = partner_groups.get(category, np.empty(0, dtype=np.intp))
+        pool = np.concatenate([exact, wildcard])
+        if pool.size == 0:
+            continue
+        pool_focus = np.concatenate([np.ones(exact.size), np.full(wildcard.size, WILDCARD_FOCUS)])
+        # Score components that depend only on the partner
+        pool_static = (10 * (SCORE_WEIGHTS["focus"] * pool_focus + SCORE_WEIGHTS["experience"] * partner_experience[pool])).astype(np.float32)
+        
+        rows = np.flatnonzero(categories == category)
+        for n_start in range(0, rows.size, need_block):
+            block_rows = rows[n_start:n_start + need_block]
+            best_score = np.full((block_rows.size, k), -np.inf, dtype=np.float32)
+            best_pos = np.full((block_rows.size, k), -1, dtype=np.intp)
+            
+            for p_start in range(0, pool.size, partner_block):
+                block_pool = pool[p_start:p_start + partner_block]
+                scores = score_block(
+                    need_lat32[block_rows], need_lon32[block_rows], need_lon_scale[block_rows], need_impact_term[block_rows],
+                    partner_lat32[block_pool], partner_lon32[block_pool], pool_static[p_start:p_start + partner_block]
+                )
+                best_score, best_pos = merge_top_k(best_score, best_pos, scores, block_pool, k)
+            
+            need_rows_out.append(np.repeat(block_rows, k))
+            partner_pos_out.append(best_pos.ravel())
+            scores_out.append(best_score.ravel())
+    
+    if not need_rows_out:
+        return pd.DataFrame({
+            "need_id": pd.Series(dtype=np.int64), "partner_id": pd.Series(dtype=np.int64),
+            "rank": pd.Series(dtype=np.int64), "match_score": pd.Series(dtype=np.float32),
+            "distance_km": pd.Series(dtype=np.float64)
+        })
+    
+    need_rows = np.concatenate(need_rows_out)
+    partner_pos = np.concatenate(partner_pos_out)
+    scores = np.concatenate(scores_out)
+    
+    # Drop padding left when a need has fewer than k compatible partners
+    keep = partner_pos >= 0
+    need_rows, partner_pos, scores = need_rows[keep], partner_pos[keep], scores[keep]
+    
+    order = np.lexsort((-scores, need_rows))
+    need_rows, partner_pos, scores = need_rows[order], partner_pos[order], scores[order]
+    starts = np.flatnonzero(np.r_[True, need_rows[1:] != need_rows[:-1]])
+    rank = np.arange(need_rows.size) - np.repeat(starts, np.diff(np.r_[starts, need_rows.size])) + 1
+    
+    return pd.DataFrame({
+        "need_id": needs_df["need_id"].to_numpy()[need_rows],
+        "partner_id": partners_df["partner_id"].to_numpy()[partner_pos],
+        "rank": rank,
+        "match_score": scores,
+        "distance_km": distance_km(need_lat[need_rows], need_lon[need_rows], partner_lat[partner_pos], partner_lon[partner_pos])
+    })
+
+# Function to generate engagement activities from the top-k scored partners of each need
+# Impact, effort and feasibility are derived from the match instead of drawn at random.
+def suggest_scored_activities(needs_df, partners_df, k=3, seed=None, need_block=512, partner_block=2048):
+    rng = np.random.default_rng(seed)
+    matches = score_partners(needs_df, partners_df, k, need_block, partner_block)
+    
+    needs = needs_df.set_index("need_id").loc[matches["need_id"]].reset_index()
+    partners = partners_df.set_index("partner_id").loc[matches["partner_id"]].reset_index()
+    codes = pick_activity_codes(needs["category"].astype(str).to_numpy(), rng)
+    
+    proximity = 1 / (1 + matches["distance_km"].to_numpy() / PROXIMITY_SCALE_KM)
+    experience = np.minimum(partners["previous_engagements"].to_numpy(), ENGAGEMENT_CAP) / ENGAGEMENT_CAP
+    score = matches["match_score"].to_numpy()
+    
+    return pd.DataFrame({
+        "need_id": matches["need_id"],
+        "partner_id": matches["partner_id"],
+        "need": needs["need"],
+        "category": needs["category"],
+        "partner_name": partners["name"].astype(str),
+        "activity_code": codes,
+        "estimated_impact": np.clip(np.rint((needs["impact_score"].to_numpy() + score) / 2), 1, 10).astype(np.int64),
+        "estimated_effort": np.clip(np.rint(10 - 9 * (0.6 * proximity + 0.4 * experience)), 1, 10).astype(np.int64),
+        "feasibility_score": np.clip(np.rint(score), 1, 10).astype(np.int64),
+        "neighborhood": needs["neighborhood"],
+        "match_rank": matches["rank"],
+        "match_score": score.round(2)
+    })
@@ -0,0 +1,69 @@
+import numpy as np
+from modules.scoring import KM_PER_DEGREE_LAT, KM_PER_DEGREE_LON, distance_km
+
+# Average number of points per grid cell the index is sized for
+POINTS_PER_CELL = 4
+MAX_CELLS = 1024
+
+# Function to build a uniform grid index over latitude/longitude arrays
+# Points are sorted by cell number (row-major), so the points of a run of cells in
+# one grid row form one contiguous slice found with a binary search.
+def build_spatial_index(lat, lon):
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    cells = int(np.clip(np.sqrt(len(lat) / POINTS_PER_CELL), 1, MAX_CELLS))
+
+    lat0 = lat.min() if len(lat) else 0.0
+    lon0 = lon.min() if len(lon) else 0.0
+    cell_lat = max(np.ptp(lat) if len(lat) else 0.0, 1e-6) / cells
+    cell_lon = max(np.ptp(lon) if len(lon) else 0.0, 1e-6) / cells
+
+    keys = cell_row(lat, lat0, cell_lat, cells) * cells + cell_row(lon, lon0, cell_lon, cells)
+    order = np.argsort(keys, kind="stable")
+    return {
+        "cells": cells,
+        "origin": (lat0, lon0),
+        "cell_size": (cell_lat, cell_lon),
+        "keys": keys[order],
+        "order": order,
+        "lat": lat[order],
+        "lon": lon[order]
+    }
+
+# Function to get the grid row (or column) of coordinates, clipped to the grid
+def cell_row(values, origin, cell_size, cells):
+    return np.clip(np.floor((values - origin) / cell_size), 0, cells - 1).astype(np.int64)
+
+# Function to find the sorted slots of the points inside a bounding box
+def bbox_slots(index, south, west, north, east):
+    cells = index["cells"]
+    lat0, lon0 = index["origin"]
+    cell_lat, cell_lon = index["cell_size"]
+    if len(index["keys"]) == 0 or south > north or west > east:
+        return np.empty(0, dtype=np.int64)
+
+    row0, row1 = cell_row(np.array([south, north]), lat0, cell_lat, cells)
+    col0, col1 = cell_row(np.array([west, east]), lon0, cell_lon, cells)
+
+    # One slice of the sorted keys per grid row
+    rows = np.arange(row0, row1 + 1) * cells
+    starts = np.searchsorted(index["keys"], rows + col0, side="left")
+    stops = np.searchsorted(index["keys"], rows + col1, side="right")
+    slots = np.concatenate([np.arange(start, stop) for start, stop in zip(starts, stops)])
+
+    lat, lon = index["lat"][slots], index["lon"][slots]
+    return slots[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]
+
+# Function to find the positions of the points inside a bounding box
+# Returns sorted positions into the arrays the index was built from.
+def query_bbox(index, south, west, north, east):
+    return np.sort(index["order"][bbox_slots(index, south, west, north, east)])
+
+# Function to find the positions of the points within radius_km of a location
+def query_radius(index, lat, lon, radius_km):
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    dlon = radius_km / (KM_PER_DEGREE_LON * max(np.cos(np.radians(lat)), 1e-6))
+    slots = bbox_slots(index, lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+    near = distance_km(lat, lon, index["lat"][slots], index["lon"][slots]) <= radius_km
+    return np.sort(index["order"][slots[near]])
@@ -0,0 +1,61 @@
+import argparse
+import os
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet as pq
+from modules.data_loader import DATA_DIR, TABLES
+
+# Function to write a frame as an uncompressed Arrow IPC file
+# Uncompressed buffers can be memory-mapped and used without a decoding copy.
+def write_arrow(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+# Function to write a frame as a Parquet file
+def write_parquet(df, path):
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+
+# Function to read an Arrow IPC file through a memory map
+# The file's pages live in the OS page cache, so every session and process that
+# maps the same file shares them; numeric columns are handed to pandas without a
+# copy where possible.
+def read_arrow(path):
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+# Function to read a Parquet file through a memory map
+def read_parquet(path):
+    return pq.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+
+# Function to convert the CSV files of a data directory to Arrow or Parquet
+def convert_csv_dir(src_dir=DATA_DIR, dst_dir=None, fmt="arrow"):
+    if fmt not in ("arrow", "parquet"):
+        raise ValueError(f"Unsupported format {fmt!r}, expected 'arrow' or 'parquet'")
+    if dst_dir is None:
+        dst_dir = src_dir
+    os.makedirs(dst_dir, exist_ok=True)
+    write = write_arrow if fmt == "arrow" else write_parquet
+
+    paths = {}
+    for table, (stem, load) in TABLES.items():
+        df = load(os.path.join(src_dir, f"{stem}.csv"))
+        paths[table] = os.path.join(dst_dir, f"{stem}.{fmt}")
+        write(df, paths[table])
+    return paths
+
+# Command line entry point: python -m modules.storage --format arrow
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert planner CSV files to Arrow IPC or Parquet.")
+    parser.add_argument("--src", default=DATA_DIR, help="directory holding the *_data.csv files")
+    parser.add_argument("--dst", default=None, help="output directory (default: same as --src)")
+    parser.add_argument("--format", default="arrow", choices=["arrow", "parquet"], dest="fmt")
+    args = parser.parse_args(argv)
+
+    for table, path in convert_csv_dir(args.src, args.dst, args.fmt).items():
+        print(f"{table} -> {path}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,65 @@
+import os
+import textwrap
+import uuid
+from string import Formatter
+import numpy as np
+import pandas as pd
 import streamlit as st
+from modules.bitmap_index import select_rows
+from modules.data_generator import describe_activities
+from modules.database import database_path, query_table
+from modules.filter_cache import cached_filter
+from modules.map_clusters import cluster_points
+from modules.scoring import need_coordinates
+from modules.spatial_index import build_spatial_index, query_radius
+from modules.partitions import DEFAULT_LOCATION, data_version, load_partition, location_dir, neighborhood_coords
 
-# Function to display an activity card
-def display_activity_card(activity):
-    st.markdown(f"""
+# Decorator that reruns a function on its own when its widgets change
+# Needs Streamlit 1.37+ (1.33+ as experimental_fragment); older versions rerun the page.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Card colour for each focus area; anything else (e.g. "Multiple") is yellow
+FOCUS_COLORS = {
+    'Environment': '#4CAF50',
+    'Social Inclusion': '#283593',
+    'Skills Development': '#E91E63'
+}
+DEFAULT_FOCUS_COLOR = '#F9DD3E'
+
+# Pixel-style marker and row colours on the partner map, with the row text colour
+# on each; anything else is yellow with black text
+MAP_COLORS = {
+    'Environment': '#5CDB95',
+    'Social Inclusion': '#3772FF',
+    'Skills Development': '#FF6F61'
+}
+MAP_TEXT_COLORS = {
+    'Social Inclusion': 'white',
+    'Skills Development': 'white'
+}
+
+# Star and bolt strings for scores 0-10, indexed by score
+STARS = np.array(['★' * i for i in range(11)], dtype=object)
+BOLTS = np.array(['⚡' * i for i in range(11)], dtype=object)
+
+# Function to split a str.format template into (literal text, field name) pairs once
+# The template is dedented so joined cards stay one HTML block in markdown.
+def compile_template(template):
+    template = textwrap.dedent(template).strip()
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+# Function to fill a compiled template for every row of a frame
+# Each piece is added to the whole column at once instead of formatting row by row.
+def fill_template(compiled, fields):
+    html = pd.Series("", index=fields.index, dtype=object)
+    for literal, field in compiled:
+        if literal:
+            html = html + literal
+        if field is not None:
+            html = html + fields[field].astype(str).astype(object)
+    return html
+
+ACTIVITY_CARD = compile_template("""
     <div style="
         border: none;
         background-color: white;
@@ -13,37 +70,24 @@ def display_activity_card(activity):
         box-shadow: 5px 5px 0px #283593;
     ">
         <h3 style="font-family: 'Montserrat', sans-serif; font-size: 20px; margin-bottom: 10px; color: #E91E63; font-weight: 700;">
-            {activity['activity_description']}
+            {title}
         </h3>
         <div style="display: flex; justify-content: space-between; margin-top: 15px;">
             <div style="font-family: 'Montserrat', sans-serif; font-size: 14px;">
-                <strong>Need:</strong> {activity['need']}<br>
-                <strong>Category:</strong> {activity['category']}<br>
-                <strong>Neighborhood:</strong> {activity['neighborhood']}
+                <strong>Need:</strong> {need}<br>
+                <strong>Category:</strong> {category}<br>
+                <strong>Neighborhood:</strong> {neighborhood}
             </div>
             <div style="font-family: 'Montserrat', sans-serif; font-size: 14px; text-align: right;">
-                <strong>Partner:</strong> {activity['partner_name']}<br>
-                <strong>Impact:</strong> {'★' * int(activity['estimated_impact'])}<br>
-                <strong>Effort:</strong> {'⚡' * int(activity['estimated_effort'])}
+                <strong>Partner:</strong> {partner_name}<br>
+                <strong>Impact:</strong> {stars}<br>
+                <strong>Effort:</strong> {bolts}
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+""")
 
-# Function to display a partner card
-def display_partner_card(partner, col):
-    # Determine card color based on focus area
-    if partner['focus_area'] == 'Environment':
-        card_color = '#4CAF50'
-    elif partner['focus_area'] == 'Social Inclusion':
-        card_color = '#283593'
-    elif partner['focus_area'] == 'Skills Development':
-        card_color = '#E91E63'
-    else:
-        card_color = '#F9DD3E'
-    
-    with col:
-        st.markdown(f"""
+PARTNER_CARD = compile_template("""
         <div style="
             background-color: white;
             border-radius: 8px;
@@ -51,24 +95,235 @@ def display_partner_card(partner, col):
             margin-bottom: 15px;
             box-shadow: 4px 4px 0px {card_color};
         ">
-            <h4 style="color: {card_color}; font-family: 'Montserrat', sans-serif; font-weight: 700; margin-bottom: 8px;">{partner['name']}</h4>
+            <h4 style="color: {card_color}; font-family: 'Montserrat', sans-serif; font-weight: 700; margin-bottom: 8px;">{name}</h4>
             <div style="font-family: 'Montserrat', sans-serif; font-size: 13px; color: #333;">
-                <p style="margin: 4px 0;"><strong>Type:</strong> {partner['type']}</p>
-                <p style="margin: 4px 0;"><strong>Focus:</strong> {partner['focus_area']}</p>
-                <p style="margin: 4px 0;"><strong>Address:</strong> {partner['address']}</p>
-                <p style="margin: 4px 0;"><strong>Contact:</strong> {partner['contact_person']}</p>
-                <p style="margin: 4px 0;"><strong>Previous engagements:</strong> {partner['previous_engagements']}</p>
+                <p style="margin: 4px 0;"><strong>Type:</strong> {type}</p>
+                <p style="margin: 4px 0;"><strong>Focus:</strong> {focus_area}</p>
+                <p style="margin: 4px 0;"><strong>Address:</strong> {address}</p>
+                <p style="margin: 4px 0;"><strong>Contact:</strong> {contact_person}</p>
+                <p style="margin: 4px 0;"><strong>Previous engagements:</strong> {previous_engagements}</p>
+            </div>
+        </div>
+""")
+
+# One-line partner summary shown under the map
+PARTNER_ROW = compile_template("""
+        <div style="
+            margin-bottom: 10px;
+            border: 3px solid black;
+            background-color: {card_color};
+            color: {text_color};
+            padding: 10px;
+            box-shadow: 4px 4px 0px #000000;
+        ">
+            <div style="font-family: 'VT323', monospace; font-size: 18px; font-weight: bold;">
+                {name}
+            </div>
+            <div style="font-family: 'Space Mono', monospace; font-size: 12px;">
+                <strong>Type:</strong> {type} | 
+                <strong>Focus:</strong> {focus_area} | 
+                <strong>Address:</strong> {address} | 
+                <strong>Contact:</strong> {contact_person} | 
+                <strong>Previous engagements:</strong> {previous_engagements}
             </div>
         </div>
+""")
+
+# Function to get the colour of each partner from its focus area
+def focus_colors(focus_areas, colors=FOCUS_COLORS, default=DEFAULT_FOCUS_COLOR):
+    return focus_areas.astype(str).map(colors).fillna(default)
+
+# Function to build the HTML of one card per activity
+def activity_cards_html(activities_df):
+    fields = activities_df[['need', 'category', 'neighborhood', 'partner_name']].assign(
+        title=describe_activities(activities_df),
+        stars=STARS[np.clip(activities_df['estimated_impact'].to_numpy(dtype=np.intp), 0, 10)],
+        bolts=BOLTS[np.clip(activities_df['estimated_effort'].to_numpy(dtype=np.intp), 0, 10)]
+    )
+    return fill_template(ACTIVITY_CARD, fields)
+
+# Function to build the HTML of one card per partner
+def partner_cards_html(partners_df):
+    fields = partners_df.assign(card_color=focus_colors(partners_df['focus_area']))
+    return fill_template(PARTNER_CARD, fields)
+
+# Function to build the HTML of one map row per partner
+def partner_rows_html(partners_df):
+    fields = partners_df.assign(
+        card_color=focus_colors(partners_df['focus_area'], MAP_COLORS),
+        text_color=focus_colors(partners_df['focus_area'], MAP_TEXT_COLORS, 'black')
+    )
+    return fill_template(PARTNER_ROW, fields)
+
+# Function to render activity cards in a single markdown call
+def render_activity_cards(activities_df):
+    if len(activities_df):
+        st.markdown("\n".join(activity_cards_html(activities_df)), unsafe_allow_html=True)
+
+# Function to render partner cards as a grid in a single markdown call
+def render_partner_cards(partners_df, columns=2):
+    if len(partners_df):
+        st.markdown(
+            f'<div style="display: grid; grid-template-columns: repeat({columns}, minmax(0, 1fr)); column-gap: 1rem;">'
+            + "\n".join(partner_cards_html(partners_df))
+            + '</div>',
+            unsafe_allow_html=True
+        )
+
+# Function to render one-line partner summaries in a single markdown call
+def render_partner_rows(partners_df):
+    if len(partners_df):
+        st.markdown("\n".join(partner_rows_html(partners_df)), unsafe_allow_html=True)
+
+PAGE_SIZES = [10, 20, 50, 100]
+
+# Function to show page size and page controls and return the visible rows of a frame
+# Only the returned slice is rendered; key keeps the controls of each list apart.
+def paginate(df, key, default_size=20):
+    total = len(df)
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col2:
+        page_size = st.selectbox("Per page", PAGE_SIZES, index=PAGE_SIZES.index(default_size), key=f"{key}_page_size")
+    pages = max(1, -(-total // page_size))
+    
+    # Filters may have shrunk the list since the page was chosen
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with col3:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    
+    start = min((int(page) - 1) * page_size, total)
+    stop = min(start + page_size, total)
+    with col1:
+        st.markdown(f"""
+        <div style="font-family: 'Montserrat', sans-serif; font-size: 14px; color: white; padding-top: 35px;">
+            showing {start + 1 if total else 0}–{stop} of {total}
+        </div>
         """, unsafe_allow_html=True)
+    return df.iloc[start:stop]
+
+# Function to display an activity card
+def display_activity_card(activity):
+    render_activity_cards(activity.to_frame().T)
+
+# Function to display a partner card
+def display_partner_card(partner, col):
+    with col:
+        render_partner_cards(partner.to_frame().T, columns=1)
+
+# Function to initialize session state for the selected location
+# Runs on every rerun. Partitions are loaded lazily into a process-wide cache and
+# shared read-only by all sessions; a session only stores references to them, plus
+# private copies of any table it has edited (see edit_session_table).
+def initialize_session_state(data_generator, location=DEFAULT_LOCATION):
+    st.session_state.location = location
+    
+    # With the SQL store, filtered rows are queried on demand instead of held in memory
+    st.session_state.database = database_path(os.path.join(location_dir(location), "planner.db"))
+    if st.session_state.database:
+        for key in ['needs_df', 'partners_df', 'activities_df']:
+            st.session_state.pop(key, None)
+        stat = os.stat(st.session_state.database)
+        st.session_state.data_version = (location, "database", stat.st_mtime_ns, stat.st_size)
+        return
+    
+    data, indexes = load_partition(location, data_generator)
+    edits = st.session_state.setdefault('edits', {})
+    for table, df in data.items():
+        st.session_state[f"{table}_df"] = edits.get((location, table), df)
+    
+    # Bitmap indexes only describe the shared tables, not this session's edited copies
+    st.session_state.indexes = {
+        table: index for table, index in indexes.items() if (location, table) not in edits
+    }
+    
+    # Identifies the data behind this session's frames, e.g. for cached filter results
+    st.session_state.data_version = (location, data_version(location), st.session_state.get('edit_token'))
+
+# Function to get a table that this session may modify
+# The first call copies the shared table for this session and location only;
+# later reruns keep serving the copy, so other sessions never see the edits.
+# Call it for every edit: it also gives the session a new data version.
+# No page edits data yet. Edits only apply to in-memory partitions: with the SQL
+# store the session holds no frames to copy, so it raises instead.
+def edit_session_table(table):
+    if st.session_state.database:
+        raise ValueError(f"Cannot edit {table!r}: the SQL store is read-only")
+    
+    key = (st.session_state.location, table)
+    edits = st.session_state.setdefault('edits', {})
+    if key not in edits:
+        edits[key] = st.session_state[f"{table}_df"].copy()
+        st.session_state[f"{table}_df"] = edits[key]
+        st.session_state.indexes.pop(table, None)
+    
+    st.session_state.edit_token = uuid.uuid4().hex
+    st.session_state.data_version = st.session_state.data_version[:2] + (st.session_state.edit_token,)
+    return edits[key]
+
+# Function to filter a session table by {column: selected values}
+# Uses the SQL store when enabled, then the bitmap indexes, then plain isin masks.
+def filter_table(table, selections):
+    if st.session_state.database:
+        return query_table(table, selections, st.session_state.database)
+    
+    df = st.session_state[f"{table}_df"]
+    index = st.session_state.indexes.get(table)
+    if index is not None:
+        return df.take(select_rows(index, selections))
+    
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in selections.items():
+        mask &= df[column].isin(values).to_numpy()
+    return df[mask]
+
+# Function to filter a session table, reusing cached results for the same selections
+def filter_session_table(table, selections):
+    return cached_filter(table, st.session_state.data_version, selections, lambda: filter_table(table, selections))
+
+# Function to get the spatial index of this session's partners and their partner_ids
+# Built once per data version and kept with the filter results. With the SQL store
+# only the id and coordinate columns are read.
+def session_spatial_index():
+    def build():
+        columns = ['partner_id', 'latitude', 'longitude']
+        if st.session_state.database:
+            points = query_table("partners", {}, st.session_state.database, columns=columns)
+        else:
+            points = st.session_state.partners_df[columns]
+        return points['partner_id'].to_numpy(), build_spatial_index(points['latitude'], points['longitude'])
+    return cached_filter("partner_spatial_index", st.session_state.data_version, {}, build)
+
+# Function to get the partners matching the partner map filters
+# area is an optional (latitude, longitude, radius_km) circle the partners must be in.
+def filter_session_partners(selections, area=None):
+    if area is None:
+        return filter_session_table("partners", selections)
+    
+    def compute():
+        partner_ids, index = session_spatial_index()
+        near_ids = partner_ids[query_radius(index, *area)]
+        partners_df = filter_session_table("partners", selections)
+        return partners_df[partners_df['partner_id'].isin(near_ids)]
+    return cached_filter("partners_in_area", st.session_state.data_version, dict(selections, area=[area]), compute)
+
+# Function to get the partners within radius_km of each need, as lists of partner_ids
+# Needs are placed at their neighborhood centre in this session's location; needs
+# whose neighborhood has no known centre get None.
+def partners_near_needs(needs_df, radius_km):
+    partner_ids, index = session_spatial_index()
+    lat, lon = need_coordinates(needs_df, None, neighborhood_coords(st.session_state.location))
+    return [
+        None if np.isnan(a) else partner_ids[query_radius(index, a, b, radius_km)].tolist()
+        for a, b in zip(lat, lon)
+    ]
 
-# Function to initialize session state
-def initialize_session_state(data_generator):
-    if 'needs_df' not in st.session_state:
-        # Generate data the first time
-        st.session_state.needs_df = data_generator.generate_local_needs()
-        st.session_state.partners_df = data_generator.generate_local_partners()
-        st.session_state.activities_df = data_generator.suggest_engagement_activities(
-            st.session_state.needs_df, 
-            st.session_state.partners_df
-        )
\ No newline at end of file
+# Function to get the map clusters of the partners matching the partner map filters
+# Cached alongside the filter results, so each filter state is binned only once.
+def cluster_session_partners(selections, area=None, cells=None):
+    return cached_filter(
+        "partner_clusters",
+        st.session_state.data_version,
+        dict(selections, area=[area], cells=[cells]),
+        lambda: cluster_points(filter_session_partners(selections, area), cells)
+    )
@@ -1,230 +1,320 @@
-import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
+import pandas as pd
+import hashlib
+import threading
 import random
+from collections import OrderedDict
+from modules.data_generator import describe_activities
 
-# Function to create a retro-styled map using Streamlit's built-in map
-def create_retro_map(df):
-    # Create a color column based on focus area
-    def get_color(focus_area):
-        if focus_area == 'Environment':
-            return '#4CAF50'  # green
-        elif focus_area == 'Social Inclusion':
-            return '#283593'  # blue
-        elif focus_area == 'Skills Development':
-            return '#E91E63'  # pink
-        else:
-            return '#F9DD3E'  # yellow
-    
-    # Make a copy to avoid modifying the original dataframe
-    map_df = df[['name', 'latitude', 'longitude', 'focus_area']].copy()
-    
-    # Display the map
-    st.map(map_df, color='focus_area')
-    
-    # Display a legend for the map
-    st.markdown("""
-    <div style="margin-top: 10px; text-align: center;">
-        <span style="font-family: 'Montserrat', sans-serif; font-size: 14px; color: white;">
-            Map markers represent partner locations (hover for details)
-        </span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Create a table with partner details
-    for idx, row in df.iterrows():
-        if row['focus_area'] == 'Environment':
-            color = '#4CAF50'  # green
-            text_color = 'black'
-        elif row['focus_area'] == 'Social Inclusion':
-            color = '#283593'  # blue
-            text_color = 'white'
-        elif row['focus_area'] == 'Skills Development':
-            color = '#E91E63'  # pink
-            text_color = 'white'
+# Pixel palette of the retro charts
+CATEGORY_COLORS = {
+    'Environment': '#5CDB95',
+    'Social Inclusion': '#3772FF',
+    'Skills Development': '#FF6F61'
+}
+
+# Wellow palette of the community charts on the impact dashboard
+DASHBOARD_COLORS = {
+    'Environment': '#4CAF50',
+    'Social Inclusion': '#283593',
+    'Skills Development': '#E91E63'
+}
+
+# Built figures keyed by (chart name, content hash), least recently used first.
+# Cached figures are shared between sessions and must not be modified.
+FIGURE_CACHE_SIZE = 32
+figure_cache = OrderedDict()
+figure_cache_lock = threading.Lock()
+
+# Function to hash the data a chart is built from
+# DataFrames are hashed by content with pandas' row hashing; other values by repr.
+def content_hash(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            digest.update(repr(list(part.columns)).encode("utf-8"))
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
         else:
-            color = '#F9DD3E'  # yellow
-            text_color = 'black'
-        
-        # Create a small card for each partner
-        st.markdown(f"""
-        <div style="
-            margin-bottom: 10px;
-            border: none;
-            background-color: white;
-            color: #333;
-            padding: 10px;
-            border-radius: 8px;
-            box-shadow: 4px 4px 0px {color};
-        ">
-            <div style="font-family: 'Montserrat', sans-serif; font-size: 18px; font-weight: bold; color: {color};">
-                {row['name']}
-            </div>
-            <div style="font-family: 'Montserrat', sans-serif; font-size: 12px;">
-                <strong>Type:</strong> {row['type']} | 
-                <strong>Focus:</strong> {row['focus_area']} | 
-                <strong>Address:</strong> {row['address']} | 
-                <strong>Contact:</strong> {row['contact_person']} | 
-                <strong>Previous engagements:</strong> {row['previous_engagements']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+            digest.update(repr(part).encode("utf-8"))
+    return digest.hexdigest()
+
+# Function to return build() for a chart's data, reusing a figure built from identical data
+def cached_figure(chart, parts, build):
+    key = (chart, content_hash(*parts))
+    with figure_cache_lock:
+        if key in figure_cache:
+            figure_cache.move_to_end(key)
+            return figure_cache[key]
+
+    fig = build()
+
+    with figure_cache_lock:
+        figure_cache[key] = fig
+        while len(figure_cache) > FIGURE_CACHE_SIZE:
+            figure_cache.popitem(last=False)
+    return fig
+
+# Layout settings shared by the community charts
+BASE_LAYOUT = dict(
+    title_font=dict(family='Montserrat', size=24, color='white'),
+    font=dict(family='Montserrat', color='white'),
+    plot_bgcolor='rgba(255, 255, 255, 0.1)',
+    paper_bgcolor='rgba(255, 255, 255, 0.1)',
+    margin=dict(t=50, b=50, l=50, r=50)
+)
+
+LEGEND = dict(
+    font=dict(family='Montserrat', size=12, color='white'),
+    bgcolor='rgba(0,0,0,0.3)',
+    bordercolor='white'
+)
+
+# Layout settings shared by the retro charts
+RETRO_LAYOUT = dict(
+    title_font=dict(family='VT323', size=24),
+    font=dict(family='Space Mono'),
+    plot_bgcolor='#1E1E3F',
+    paper_bgcolor='#1E1E3F',
+    margin=dict(t=50, b=50, l=50, r=50)
+)
+
+RETRO_AXIS = dict(
+    showgrid=True,
+    gridcolor='rgba(249, 221, 62, 0.2)',
+    showline=True,
+    linecolor='#F9DD3E',
+    linewidth=2
+)
+
+# Prebuilt layouts; building a figure only adds traces to one of these
+IMPACT_MATRIX_LAYOUT = go.Layout(
+    RETRO_LAYOUT,
+    template="plotly_dark",
+    title='IMPACT vs EFFORT MATRIX',
+    legend=dict(title=dict(text='category')),
+    xaxis=dict(RETRO_AXIS, title='EFFORT LEVEL', range=[0, 11]),
+    yaxis=dict(RETRO_AXIS, title='IMPACT LEVEL', range=[0, 11]),
+    # Quadrant lines
+    shapes=[
+        dict(type="line", x0=5.5, y0=0, x1=5.5, y1=11, line=dict(color="#F9DD3E", width=2, dash="dash")),
+        dict(type="line", x0=0, y0=5.5, x1=11, y1=5.5, line=dict(color="#F9DD3E", width=2, dash="dash"))
+    ],
+    # Quadrant labels
+    annotations=[
+        dict(x=3, y=8, text="HIGH IMPACT,<br>LOW EFFORT<br>(QUICK WINS)", 
+             showarrow=False, font=dict(family="VT323", size=14, color="#F9DD3E")),
+        dict(x=8, y=8, text="HIGH IMPACT,<br>HIGH EFFORT<br>(MAJOR PROJECTS)", 
+             showarrow=False, font=dict(family="VT323", size=14, color="#F9DD3E")),
+        dict(x=3, y=3, text="LOW IMPACT,<br>LOW EFFORT<br>(FILL-INS)", 
+             showarrow=False, font=dict(family="VT323", size=14, color="#F9DD3E")),
+        dict(x=8, y=3, text="LOW IMPACT,<br>HIGH EFFORT<br>(AVOID)", 
+             showarrow=False, font=dict(family="VT323", size=14, color="#F9DD3E"))
+    ]
+)
+
+PARTICIPATION_LAYOUT = go.Layout(
+    BASE_LAYOUT,
+    title='community participation',
+    xaxis=dict(
+        title=None,
+        showgrid=False,
+        showline=True,
+        linecolor='white',
+        linewidth=2,
+        color='white'
+    ),
+    yaxis=dict(
+        title='participants',
+        showgrid=True,
+        gridcolor='rgba(255, 255, 255, 0.2)',
+        showline=True,
+        linecolor='white',
+        linewidth=2,
+        color='white'
+    ),
+    legend=LEGEND
+)
+
+CATEGORY_DISTRIBUTION_LAYOUT = go.Layout(
+    BASE_LAYOUT,
+    title='activities by category',
+    legend=LEGEND
+)
+
+NEIGHBORHOOD_LAYOUT = go.Layout(
+    RETRO_LAYOUT,
+    title='NEIGHBORHOOD ENGAGEMENT',
+    xaxis=dict(RETRO_AXIS, title='COUNT / SCORE'),
+    yaxis=dict(RETRO_AXIS, title=None, showgrid=False),
+    margin=dict(t=50, b=50, l=120, r=50),
+    legend=dict(
+        font=dict(family='VT323', size=16),
+        bgcolor='rgba(0,0,0,0.5)',
+        bordercolor='#F9DD3E'
+    ),
+    barmode='group'
+)
+
+# Above this many activities the impact matrix shows (effort, impact) cells with
+# counts instead of one labelled marker per activity
+IMPACT_MATRIX_THRESHOLD = 2000
 
 # Create an impact vs effort matrix chart
+# Marker area follows feasibility_score; hover text is only built when the figure is.
 def create_impact_matrix(activities_df):
-    fig = px.scatter(
-        activities_df,
-        x='estimated_effort',
-        y='estimated_impact',
-        color='category',
-        size='feasibility_score',
-        hover_name='activity_description',
-        text='partner_name',
-        color_discrete_map={
-            'Environment': '#4CAF50',
-            'Social Inclusion': '#283593',
-            'Skills Development': '#E91E63'
-        },
-        template="plotly_dark"
-    )
+    if len(activities_df) > IMPACT_MATRIX_THRESHOLD:
+        return create_impact_cells(activities_df)
     
-    fig.update_layout(
-        title='impact vs effort matrix',
-        title_font=dict(family='Montserrat', size=24, color='white'),
-        font=dict(family='Montserrat', color='white'),
-        plot_bgcolor='rgba(255, 255, 255, 0.1)',
-        paper_bgcolor='rgba(255, 255, 255, 0.1)',
-        xaxis=dict(
-            title='effort level',
-            showgrid=True,
-            gridcolor='rgba(255, 255, 255, 0.2)',
-            showline=True,
-            linecolor='white',
-            linewidth=2,
-            range=[0, 11],
-            color='white'
-        ),
-        yaxis=dict(
-            title='impact level',
-            showgrid=True,
-            gridcolor='rgba(255, 255, 255, 0.2)',
-            showline=True,
-            linecolor='white',
-            linewidth=2,
-            range=[0, 11],
-            color='white'
-        ),
-        margin=dict(t=50, b=50, l=50, r=50),
-    )
+    columns = ['estimated_effort', 'estimated_impact', 'category', 'feasibility_score', 'partner_name', 'need', 'activity_code']
+    data = activities_df[columns]
     
-    # Add quadrant lines
-    fig.add_shape(type="line", x0=5.5, y0=0, x1=5.5, y1=11, line=dict(color="white", width=2, dash="dash"))
-    fig.add_shape(type="line", x0=0, y0=5.5, x1=11, y1=5.5, line=dict(color="white", width=2, dash="dash"))
+    def build():
+        hover = describe_activities(data)
+        sizeref = 2.0 * max(data['feasibility_score'].max(), 1) / (20 ** 2) if len(data) else 1
+        traces = []
+        for category in pd.unique(data['category'].astype(str)):
+            rows = (data['category'].astype(str) == category).to_numpy()
+            traces.append(go.Scatter(
+                x=data['estimated_effort'][rows],
+                y=data['estimated_impact'][rows],
+                text=data['partner_name'][rows],
+                hovertext=hover[rows],
+                mode='markers+text',
+                name=category,
+                legendgroup=category,
+                marker=dict(
+                    color=CATEGORY_COLORS.get(category),
+                    size=data['feasibility_score'][rows],
+                    sizemode='area',
+                    sizeref=sizeref
+                ),
+                hovertemplate='<b>%{hovertext}</b><br><br>effort=%{x}<br>impact=%{y}<br>partner=%{text}<extra></extra>'
+            ))
+        return go.Figure(data=traces, layout=IMPACT_MATRIX_LAYOUT)
     
-    # Add quadrant labels
-    fig.add_annotation(x=3, y=8, text="high impact,<br>low effort<br>(quick wins)", 
-                      showarrow=False, font=dict(family="Montserrat", size=12, color="white"))
-    fig.add_annotation(x=8, y=8, text="high impact,<br>high effort<br>(major projects)", 
-                      showarrow=False, font=dict(family="Montserrat", size=12, color="white"))
-    fig.add_annotation(x=3, y=3, text="low impact,<br>low effort<br>(fill-ins)", 
-                      showarrow=False, font=dict(family="Montserrat", size=12, color="white"))
-    fig.add_annotation(x=8, y=3, text="low impact,<br>high effort<br>(avoid)", 
-                      showarrow=False, font=dict(family="Montserrat", size=12, color="white"))
-    
-    return fig
+    return cached_figure('impact_matrix', [data], build)
 
-# Create a participation trend chart
-def create_participation_trend():
-    # Generate mock monthly data for the past 6 months
-    months = ["November", "December", "January", "February", "March", "April"]
-    participants = [random.randint(15, 40) for _ in range(6)]
-    cumulative = [sum(participants[:i+1]) for i in range(6)]
-    
-    # Create the trend chart
-    fig = go.Figure()
+# Create the impact matrix for large activity sets
+# Activities are counted per (category, effort, impact) cell; marker area follows the
+# count and categories sit side by side within a cell so they do not hide each other.
+def create_impact_cells(activities_df):
+    cells = activities_df.groupby(
+        [activities_df['category'].astype(str), 'estimated_effort', 'estimated_impact'], sort=False
+    ).agg(count=('feasibility_score', 'size'), feasibility=('feasibility_score', 'mean')).reset_index()
     
-    # Add monthly participants bars
-    fig.add_trace(go.Bar(
-        x=months,
-        y=participants,
-        name='Monthly Participants',
-        marker_color='#F9DD3E'
-    ))
+    def build():
+        categories = list(pd.unique(cells['category']))
+        sizeref = 2.0 * max(cells['count'].max(), 1) / (30 ** 2) if len(cells) else 1
+        traces = []
+        for i, category in enumerate(categories):
+            rows = cells[cells['category'] == category]
+            offset = (i - (len(categories) - 1) / 2) * 0.25
+            traces.append(go.Scatter(
+                x=rows['estimated_effort'] + offset,
+                y=rows['estimated_impact'],
+                text=rows['count'],
+                customdata=rows[['estimated_effort', 'feasibility']],
+                mode='markers+text',
+                textposition='middle center',
+                name=category,
+                legendgroup=category,
+                marker=dict(
+                    color=CATEGORY_COLORS.get(category),
+                    size=rows['count'],
+                    sizemode='area',
+                    sizeref=sizeref
+                ),
+                hovertemplate='<b>%{text} activities</b><br><br>effort=%{customdata[0]}<br>impact=%{y}<br>mean feasibility=%{customdata[1]:.1f}<extra>' + category + '</extra>'
+            ))
+        return go.Figure(data=traces, layout=IMPACT_MATRIX_LAYOUT)
     
-    # Add cumulative line
-    fig.add_trace(go.Scatter(
-        x=months,
-        y=cumulative,
-        name='Cumulative Participants',
-        mode='lines+markers',
-        line=dict(color='#E91E63', width=4),
-        marker=dict(size=10)
-    ))
+    return cached_figure('impact_cells', [cells], build)
+
+# Create a participation trend chart
+# participants holds monthly counts; mock counts are drawn when it is not given.
+def create_participation_trend(participants=None, months=None):
+    if months is None:
+        months = ["November", "December", "January", "February", "March", "April"]
+    if participants is None:
+        participants = [random.randint(15, 40) for _ in range(len(months))]
     
-    fig.update_layout(
-        title='community participation',
-        title_font=dict(family='Montserrat', size=24, color='white'),
-        font=dict(family='Montserrat', color='white'),
-        plot_bgcolor='rgba(255, 255, 255, 0.1)',
-        paper_bgcolor='rgba(255, 255, 255, 0.1)',
-        xaxis=dict(
-            title=None,
-            showgrid=False,
-            showline=True,
-            linecolor='white',
-            linewidth=2,
-            color='white'
-        ),
-        yaxis=dict(
-            title='participants',
-            showgrid=True,
-            gridcolor='rgba(255, 255, 255, 0.2)',
-            showline=True,
-            linecolor='white',
-            linewidth=2,
-            color='white'
-        ),
-        margin=dict(t=50, b=50, l=50, r=50),
-        legend=dict(
-            font=dict(family='Montserrat', size=12, color='white'),
-            bgcolor='rgba(0,0,0,0.3)',
-            bordercolor='white'
+    def build():
+        cumulative = [sum(participants[:i+1]) for i in range(len(participants))]
+        return go.Figure(
+            data=[
+                # Monthly participants bars
+                go.Bar(
+                    x=months,
+                    y=participants,
+                    name='Monthly Participants',
+                    marker_color='#F9DD3E'
+                ),
+                # Cumulative line
+                go.Scatter(
+                    x=months,
+                    y=cumulative,
+                    name='Cumulative Participants',
+                    mode='lines+markers',
+                    line=dict(color='#E91E63', width=4),
+                    marker=dict(size=10)
+                )
+            ],
+            layout=PARTICIPATION_LAYOUT
         )
-    )
     
-    return fig
+    return cached_figure('participation_trend', [list(months), list(participants)], build)
 
 # Create a categories pie chart
-def create_category_distribution():
-    # Create mock data for the categories
-    categories = ['Environment', 'Social Inclusion', 'Skills Development']
-    category_counts = [random.randint(3, 10) for _ in range(3)]
+# category_counts maps each category to its number of activities; mock counts are
+# drawn when it is not given.
+def create_category_distribution(category_counts=None):
+    if category_counts is None:
+        category_counts = {category: random.randint(3, 10) for category in DASHBOARD_COLORS}
     
-    # Create a pie chart
-    fig = px.pie(
-        values=category_counts,
-        names=categories,
-        color=categories,
-        color_discrete_map={
-            'Environment': '#4CAF50',
-            'Social Inclusion': '#283593',
-            'Skills Development': '#E91E63'
-        },
-        hole=0.4
-    )
+    def build():
+        categories = list(category_counts)
+        return go.Figure(
+            data=[go.Pie(
+                labels=categories,
+                values=list(category_counts.values()),
+                marker=dict(colors=[DASHBOARD_COLORS.get(c) for c in categories], line=dict(color='#000000', width=2)),
+                hole=0.4,
+                textfont=dict(family='VT323', size=18),
+                textinfo='percent+label'
+            )],
+            layout=CATEGORY_DISTRIBUTION_LAYOUT
+        )
     
-    fig.update_layout(
-        title='activities by category',
-        title_font=dict(family='Montserrat', size=24, color='white'),
-        font=dict(family='Montserrat', color='white'),
-        plot_bgcolor='rgba(255, 255, 255, 0.1)',
-        paper_bgcolor='rgba(255, 255, 255, 0.1)',
-        margin=dict(t=50, b=50, l=50, r=50),
-        legend=dict(
-            font=dict(family='Montserrat', size=12, color='white'),
-            bgcolor='rgba(0,0,0,0.3)',
-            bordercolor='white'
+    return cached_figure('category_distribution', [sorted(category_counts.items())], build)
+
+# Create the neighborhood engagement chart: activity counts as bars, scores as markers
+def create_neighborhood_engagement(neighborhoods, activities_count, engagement_score):
+    def build():
+        return go.Figure(
+            data=[
+                # Bars for activities count
+                go.Bar(
+                    y=neighborhoods,
+                    x=activities_count,
+                    name='Activities',
+                    orientation='h',
+                    marker_color='#F9DD3E'
+                ),
+                # Markers for engagement score
+                go.Scatter(
+                    y=neighborhoods,
+                    x=engagement_score,
+                    name='Engagement Score',
+                    mode='markers',
+                    marker=dict(
+                        size=15,
+                        symbol='square',
+                        color='#FF6F61',
+                        line=dict(color='#000000', width=2)
+                    )
+                )
+            ],
+            layout=NEIGHBORHOOD_LAYOUT
         )
-    )
     
-    return fig
\ No newline at end of file
+    return cached_figure('neighborhood_engagement', [list(neighborhoods), list(activities_count), list(engagement_score)], build)
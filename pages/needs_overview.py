@@ -1,21 +1,50 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from modules.styles import pixel_metric
+from modules.data_generator import NEED_CATEGORIES, PRIORITIES
+from modules.utils import fragment, paginate, partners_near_needs
+
+# Radius (km) for the partners counted as near a need
+NEARBY_RADIUS_KM = 1.0
+
+CELL_CSS = 'background-color: {background}; color: {color}; font-family: "VT323", monospace; text-align: center; border: 2px solid black;'
+
+# Cell styles in PRIORITIES and NEED_CATEGORIES order. Unknown values get code -1,
+# which picks the last style, as the final else branch used to.
+PRIORITY_CSS = np.array([
+    CELL_CSS.format(background='#FF6F61', color='white'),
+    CELL_CSS.format(background='#F9DD3E', color='black'),
+    CELL_CSS.format(background='#5CDB95', color='black')
+], dtype=object)
+
+CATEGORY_CSS = np.array([
+    CELL_CSS.format(background='#5CDB95', color='black'),
+    CELL_CSS.format(background='#3772FF', color='white'),
+    CELL_CSS.format(background='#FF6F61', color='white')
+], dtype=object)
+
+# Function to build the CSS of every cell of the displayed needs table at once
+def cell_styles(display_needs):
+    styles = pd.DataFrame('', index=display_needs.index, columns=display_needs.columns)
+    styles['Priority'] = PRIORITY_CSS[pd.Categorical(display_needs['Priority'], categories=PRIORITIES).codes]
+    styles['Category'] = CATEGORY_CSS[pd.Categorical(display_needs['Category'], categories=NEED_CATEGORIES).codes]
+    return styles
 
 def show_needs_overview(filtered_needs):
-    st.markdown('<h2 style="text-align: center; text-transform: lowercase;">local needs overview</h2>', unsafe_allow_html=True)
+    st.markdown('<h2 style="text-align: center;">LOCAL NEEDS OVERVIEW</h2>', unsafe_allow_html=True)
     
     # Summary metrics
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.markdown(pixel_metric("total needs", len(filtered_needs)), unsafe_allow_html=True)
+        st.markdown(pixel_metric("TOTAL NEEDS", len(filtered_needs)), unsafe_allow_html=True)
     with col2:
         high_priority = len(filtered_needs[filtered_needs['priority'] == 'High'])
-        st.markdown(pixel_metric("high priority", high_priority, color="#E91E63"), unsafe_allow_html=True)
+        st.markdown(pixel_metric("HIGH PRIORITY", high_priority, color="#FF6F61"), unsafe_allow_html=True)
     with col3:
         neighborhoods_count = filtered_needs['neighborhood'].nunique()
-        st.markdown(pixel_metric("neighborhoods", neighborhoods_count, color="#4CAF50"), unsafe_allow_html=True)
+        st.markdown(pixel_metric("NEIGHBORHOODS", neighborhoods_count, color="#5CDB95"), unsafe_allow_html=True)
     
     # Needs by category chart
     cat_counts = filtered_needs['category'].value_counts().reset_index()
@@ -27,35 +56,33 @@ def show_needs_overview(filtered_needs):
         y='Count',
         color='Category',
         color_discrete_map={
-            'Environment': '#4CAF50',
-            'Social Inclusion': '#283593',
-            'Skills Development': '#E91E63'
+            'Environment': '#5CDB95',
+            'Social Inclusion': '#3772FF',
+            'Skills Development': '#FF6F61'
         },
         template="plotly_dark"
     )
     
     fig.update_layout(
-        title='needs by category',
-        title_font=dict(family='Montserrat', size=24, color='white'),
-        font=dict(family='Montserrat', color='white'),
-        plot_bgcolor='rgba(255, 255, 255, 0.1)',
-        paper_bgcolor='rgba(255, 255, 255, 0.1)',
+        title='NEEDS BY CATEGORY',
+        title_font=dict(family='VT323', size=24),
+        font=dict(family='Space Mono'),
+        plot_bgcolor='#1E1E3F',
+        paper_bgcolor='#1E1E3F',
         xaxis=dict(
             title=None,
             showgrid=False,
             showline=True,
-            linecolor='white',
-            linewidth=2,
-            color='white'
+            linecolor='#F9DD3E',
+            linewidth=2
         ),
         yaxis=dict(
             title=None,
             showgrid=True,
-            gridcolor='rgba(255, 255, 255, 0.2)',
+            gridcolor='rgba(249, 221, 62, 0.2)',
             showline=True,
-            linecolor='white',
-            linewidth=2,
-            color='white'
+            linecolor='#F9DD3E',
+            linewidth=2
         ),
         margin=dict(t=50, b=50, l=50, r=50),
     )
@@ -63,31 +90,24 @@ def show_needs_overview(filtered_needs):
     st.plotly_chart(fig, use_container_width=True)
     
     # Detailed needs table
-    st.markdown('<h3 style="text-align: center; margin-top: 30px; text-transform: lowercase;">detailed needs</h3>', unsafe_allow_html=True)
+    st.markdown('<h3 style="text-align: center; margin-top: 30px;">DETAILED NEEDS</h3>', unsafe_allow_html=True)
+    
+    needs_table(filtered_needs)
+
+# Paged needs table; changing the page reruns only this table
+@fragment
+def needs_table(filtered_needs):
+    # Only the visible page of needs is formatted, styled and sent
+    page_needs = paginate(filtered_needs, "needs_table")
     
     # Format the DataFrame for display
-    display_needs = filtered_needs[['need', 'category', 'priority', 'neighborhood', 'impact_score']].copy()
+    display_needs = page_needs[['need', 'category', 'priority', 'neighborhood', 'impact_score']].copy()
     display_needs.columns = ['Need', 'Category', 'Priority', 'Neighborhood', 'Impact Score']
+    # Blank for needs whose neighborhood has no known centre
+    nearby = partners_near_needs(page_needs, NEARBY_RADIUS_KM)
+    display_needs['Partners Nearby'] = pd.array([None if ids is None else len(ids) for ids in nearby], dtype="Int64")
     
-    # Add color coding for priorities
-    def color_priority(val):
-        if val == 'High':
-            return 'background-color: #E91E63; color: white; font-family: "Montserrat", sans-serif; text-align: center; border-radius: 4px; font-weight: 500;'
-        elif val == 'Medium':
-            return 'background-color: #F9DD3E; color: black; font-family: "Montserrat", sans-serif; text-align: center; border-radius: 4px; font-weight: 500;'
-        else:
-            return 'background-color: #4CAF50; color: white; font-family: "Montserrat", sans-serif; text-align: center; border-radius: 4px; font-weight: 500;'
-    
-    # Add color coding for categories
-    def color_category(val):
-        if val == 'Environment':
-            return 'background-color: #4CAF50; color: white; font-family: "Montserrat", sans-serif; text-align: center; border-radius: 4px; font-weight: 500;'
-        elif val == 'Social Inclusion':
-            return 'background-color: #283593; color: white; font-family: "Montserrat", sans-serif; text-align: center; border-radius: 4px; font-weight: 500;'
-        else:
-            return 'background-color: #E91E63; color: white; font-family: "Montserrat", sans-serif; text-align: center; border-radius: 4px; font-weight: 500;'
-    
-    # Style the dataframe
-    styled_needs = display_needs.style.applymap(color_priority, subset=['Priority']).applymap(color_category, subset=['Category'])
+    # Style the dataframe: colour Priority and Category from their category codes
+    styled_needs = display_needs.style.apply(cell_styles, axis=None)
     
-    st.dataframe(styled_needs, height=400, use_container_width=True)
\ No newline at end of file
+    st.dataframe(styled_needs, height=400, use_container_width=True)
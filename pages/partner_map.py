@@ -1,14 +1,29 @@
 import streamlit as st
-from modules.visualizations import create_retro_map
+from modules.maps import create_retro_map
+from modules.database import distinct_values
+from modules.map_clusters import CLUSTER_THRESHOLD
+from modules.partitions import neighborhood_coords
+from modules.utils import cluster_session_partners, filter_session_partners, fragment, paginate, render_partner_cards
 
-def show_partner_map(filtered_partners):
-    st.markdown('<h2 style="text-align: center; text-transform: lowercase;">local partner map</h2>', unsafe_allow_html=True)
+def show_partner_map():
+    st.markdown('<h2 style="text-align: center;">LOCAL PARTNER MAP</h2>', unsafe_allow_html=True)
     
+    partner_map_section()
+
+# Filters, map and directory; changing a filter reruns only this section
+@fragment
+def partner_map_section():
     # Partner type and focus area filters
     col1, col2 = st.columns(2)
     
+    # Option lists come from the SQL store's indexes when it is enabled
+    database = st.session_state.get('database')
+    
     with col1:
-        partner_types = sorted(st.session_state.partners_df['type'].unique())
+        if database:
+            partner_types = distinct_values("partners", "type", database)
+        else:
+            partner_types = sorted(st.session_state.partners_df['type'].unique())
         selected_types = st.multiselect(
             "Filter by Partner Type",
             partner_types,
@@ -16,42 +31,66 @@ def show_partner_map(filtered_partners):
         )
     
     with col2:
-        focus_areas = sorted(st.session_state.partners_df['focus_area'].unique())
+        if database:
+            focus_areas = distinct_values("partners", "focus_area", database)
+        else:
+            focus_areas = sorted(st.session_state.partners_df['focus_area'].unique())
         selected_focus = st.multiselect(
             "Filter by Focus Area",
             focus_areas,
             default=focus_areas
         )
     
+    # Optional search area around the centre of one of the location's neighborhoods;
+    # offered only for neighborhoods with a known centre
+    if database:
+        neighborhoods = distinct_values("needs", "neighborhood", database)
+    else:
+        neighborhoods = sorted(st.session_state.needs_df['neighborhood'].unique())
+    coords = neighborhood_coords(st.session_state.location)
+    area_names = [name for name in neighborhoods if name in coords]
+    
+    area = None
+    if area_names:
+        col1, col2 = st.columns(2)
+        with col1:
+            area_name = st.selectbox("Search Area", ["Everywhere"] + area_names)
+        with col2:
+            radius_km = st.slider("Radius (km)", 0.5, 5.0, 1.0, step=0.5, disabled=area_name == "Everywhere")
+        if area_name != "Everywhere":
+            area = tuple(coords[area_name]) + (radius_km,)
+    
     # Filter partners based on selections
-    filtered_partners = st.session_state.partners_df[
-        (st.session_state.partners_df['type'].isin(selected_types)) &
-        (st.session_state.partners_df['focus_area'].isin(selected_focus))
-    ]
+    selections = {
+        "type": selected_types,
+        "focus_area": selected_focus
+    }
+    filtered_partners = filter_session_partners(selections, area)
     
-    # Display map
+    # Display map, clustered when there are too many partners to draw one by one
     if not filtered_partners.empty:
         st.markdown('<div style="margin: 30px 0;"></div>', unsafe_allow_html=True)
-        create_retro_map(filtered_partners)
+        clusters = cluster_session_partners(selections, area) if len(filtered_partners) > CLUSTER_THRESHOLD else None
+        create_retro_map(filtered_partners, clusters)
         
         # Partner legend
         st.markdown("""
         <div style="margin-top: 20px; text-align: center;">
             <div style="display: inline-block; margin: 0 15px;">
-                <div style="width: 15px; height: 15px; background-color: #4CAF50; border-radius: 4px; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
-                <span style="font-family: 'Montserrat', sans-serif; color: white;">Environment</span>
+                <div style="width: 15px; height: 15px; background-color: #5CDB95; border: 2px solid black; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
+                <span style="font-family: 'Space Mono', monospace; color: white;">Environment</span>
             </div>
             <div style="display: inline-block; margin: 0 15px;">
-                <div style="width: 15px; height: 15px; background-color: #283593; border-radius: 4px; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
-                <span style="font-family: 'Montserrat', sans-serif; color: white;">Social Inclusion</span>
+                <div style="width: 15px; height: 15px; background-color: #3772FF; border: 2px solid black; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
+                <span style="font-family: 'Space Mono', monospace; color: white;">Social Inclusion</span>
             </div>
             <div style="display: inline-block; margin: 0 15px;">
-                <div style="width: 15px; height: 15px; background-color: #E91E63; border-radius: 4px; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
-                <span style="font-family: 'Montserrat', sans-serif; color: white;">Skills Development</span>
+                <div style="width: 15px; height: 15px; background-color: #FF6F61; border: 2px solid black; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
+                <span style="font-family: 'Space Mono', monospace; color: white;">Skills Development</span>
             </div>
             <div style="display: inline-block; margin: 0 15px;">
-                <div style="width: 15px; height: 15px; background-color: #F9DD3E; border-radius: 4px; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
-                <span style="font-family: 'Montserrat', sans-serif; color: white;">Multiple</span>
+                <div style="width: 15px; height: 15px; background-color: #F9DD3E; border: 2px solid black; display: inline-block; vertical-align: middle; margin-right: 5px;"></div>
+                <span style="font-family: 'Space Mono', monospace; color: white;">Multiple</span>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -60,39 +99,6 @@ def show_partner_map(filtered_partners):
         st.markdown('<h3 style="text-align: center; margin-top: 30px; text-transform: lowercase;">partner directory</h3>', unsafe_allow_html=True)
         
         # Display partners in card format
-        cols = st.columns(2)
-        
-        for i, (_, partner) in enumerate(filtered_partners.iterrows()):
-            col_idx = i % 2
-            
-            # Determine card color based on focus area
-            if partner['focus_area'] == 'Environment':
-                card_color = '#4CAF50'
-            elif partner['focus_area'] == 'Social Inclusion':
-                card_color = '#283593'
-            elif partner['focus_area'] == 'Skills Development':
-                card_color = '#E91E63'
-            else:
-                card_color = '#F9DD3E'
-            
-            with cols[col_idx]:
-                st.markdown(f"""
-                <div style="
-                    background-color: white;
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin-bottom: 15px;
-                    box-shadow: 4px 4px 0px {card_color};
-                ">
-                    <h4 style="color: {card_color}; font-family: 'Montserrat', sans-serif; font-weight: 700; margin-bottom: 8px;">{partner['name']}</h4>
-                    <div style="font-family: 'Montserrat', sans-serif; font-size: 13px; color: #333;">
-                        <p style="margin: 4px 0;"><strong>Type:</strong> {partner['type']}</p>
-                        <p style="margin: 4px 0;"><strong>Focus:</strong> {partner['focus_area']}</p>
-                        <p style="margin: 4px 0;"><strong>Address:</strong> {partner['address']}</p>
-                        <p style="margin: 4px 0;"><strong>Contact:</strong> {partner['contact_person']}</p>
-                        <p style="margin: 4px 0;"><strong>Previous engagements:</strong> {partner['previous_engagements']}</p>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+        render_partner_cards(paginate(filtered_partners, "partner_directory"))
     else:
         st.error("No partners match the selected filters.")
\ No newline at end of file
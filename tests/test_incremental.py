@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+from modules.data_generator import generate_local_needs, generate_local_partners
+from modules.data_loader import load_all
+from modules.incremental import append_needs, update_partners
+from modules.scoring import suggest_scored_activities
+
+# Columns that follow from the match; activity_code is a random template pick and
+# is drawn afresh for every recomputed need, so it is not compared
+MATCH_COLUMNS = [
+    "need_id", "partner_id", "match_rank", "match_score",
+    "estimated_impact", "estimated_effort", "feasibility_score"
+]
+
+def full_rebuild(needs_df, partners_df):
+    activities = suggest_scored_activities(needs_df, partners_df, seed=0)
+    return activities.sort_values(["need_id", "match_rank"], kind="stable").reset_index(drop=True)
+
+def assert_same_matches(incremental, rebuilt):
+    incremental = incremental.sort_values(["need_id", "match_rank"], kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(
+        incremental[MATCH_COLUMNS].astype("float64"),
+        rebuilt[MATCH_COLUMNS].astype("float64")
+    )
+
+def partner_rows(partners_df, **columns):
+    rows = pd.DataFrame(columns)
+    for col in partners_df.columns:
+        if col not in rows.columns:
+            rows[col] = partners_df[col].iloc[0]
+    return rows[partners_df.columns].astype(partners_df.dtypes.to_dict())
+
+@pytest.fixture(params=["data", "generated"])
+def tables(request):
+    if request.param == "data":
+        tables = load_all()
+        needs_df, partners_df = tables["needs"], tables["partners"]
+    else:
+        needs_df = generate_local_needs(400, seed=1)
+        partners_df = generate_local_partners(120, seed=2)
+        # Some needs in a neighborhood without coordinates sit at the partners' centroid
+        needs_df["neighborhood"] = needs_df["neighborhood"].astype(str)
+        needs_df.loc[::10, "neighborhood"] = "Unknown"
+    return needs_df, partners_df, full_rebuild(needs_df, partners_df)
+
+def test_append_needs_matches_full_rebuild(tables):
+    needs_df, partners_df, activities_df = tables
+    new_needs = generate_local_needs(25, seed=3).drop(columns="need_id")
+
+    updated_needs, activities = append_needs(needs_df, partners_df, activities_df, new_needs, seed=0)
+
+    assert len(updated_needs) == len(needs_df) + 25
+    assert_same_matches(activities, full_rebuild(updated_needs, partners_df))
+
+def test_added_partner_matches_full_rebuild(tables):
+    needs_df, partners_df, activities_df = tables
+    added = partner_rows(
+        partners_df,
+        partner_id=[int(partners_df["partner_id"].max()) + 1],
+        focus_area=["Environment"],
+        previous_engagements=[40],
+        latitude=[48.8625],
+        longitude=[2.4435]
+    )
+
+    updated_partners, activities = update_partners(needs_df, partners_df, activities_df, added, seed=0)
+
+    assert_same_matches(activities, full_rebuild(needs_df, updated_partners))
+
+def test_changed_partner_matches_full_rebuild(tables):
+    needs_df, partners_df, activities_df = tables
+    changed = partners_df.iloc[[2]].copy()
+    changed["focus_area"] = "Multiple"
+    changed["previous_engagements"] = 0
+    changed["latitude"] += 0.01
+
+    updated_partners, activities = update_partners(needs_df, partners_df, activities_df, changed, seed=0)
+
+    assert_same_matches(activities, full_rebuild(needs_df, updated_partners))
+
+def test_removed_partners_match_full_rebuild(tables):
+    needs_df, partners_df, activities_df = tables
+    removed = partners_df["partner_id"].iloc[[0, 5]].tolist()
+
+    updated_partners, activities = update_partners(
+        needs_df, partners_df, activities_df, partners_df.iloc[:0], removed_ids=removed, seed=0
+    )
+
+    assert not np.isin(updated_partners["partner_id"], removed).any()
+    assert_same_matches(activities, full_rebuild(needs_df, updated_partners))
+
+def test_centroid_shift_refreshes_needs_without_coordinates(tables):
+    needs_df, partners_df, activities_df = tables
+    # A distant Environment partner moves the centroid that needs in unknown
+    # neighborhoods are placed at, whatever their category
+    added = partner_rows(
+        partners_df,
+        partner_id=[int(partners_df["partner_id"].max()) + 1],
+        focus_area=["Environment"],
+        latitude=[49.4],
+        longitude=[2.9]
+    )
+
+    updated_partners, activities = update_partners(needs_df, partners_df, activities_df, added, seed=0)
+
+    assert_same_matches(activities, full_rebuild(needs_df, updated_partners))